@@ -0,0 +1,157 @@
+"""In-process admission control and load shedding.
+
+Requests are matched to a route class. Each class has its own concurrency
+limit and a bounded wait queue, so a burst of searches cannot take the
+database pool away from check-ins. Expensive classes also get a per-client
+token bucket. When a class is saturated the middleware answers right away:
+``429`` when the client is over its rate, ``503`` when the queue is full or
+the wait times out. Both carry ``Retry-After``.
+"""
+import asyncio
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import Settings
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded number of waiters and a wait timeout."""
+
+    def __init__(self, limit: int, max_queue: int, timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._sem = asyncio.Semaphore(limit)
+        self._waiting = 0
+
+    async def acquire(self) -> bool:
+        if self._sem.locked() and self._waiting >= self.max_queue:
+            return False
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    def release(self) -> None:
+        self._sem.release()
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets; the least recently seen clients are evicted."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # client -> (tokens, last_refill)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def allow(self, client: str) -> tuple[bool, float]:
+        """Take a token for ``client``; returns (allowed, seconds until next token)."""
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (1.0 - tokens) / self.rate
+        return allowed, retry_after
+
+
+@dataclass
+class AdmissionRule:
+    name: str
+    methods: frozenset[str]
+    pattern: re.Pattern
+    limiter: ConcurrencyLimiter
+    rate_limiter: Optional[TokenBucketLimiter] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and self.pattern.fullmatch(path) is not None
+
+
+def build_rules(settings: Settings) -> list[AdmissionRule]:
+    """Route classes in match order; unmatched requests are not limited."""
+    timeout = settings.ADMISSION_QUEUE_TIMEOUT
+    return [
+        # check-in/out writes are cheap and latency-sensitive: their own,
+        # larger budget that searches can never consume
+        AdmissionRule(
+            name="checkin",
+            methods=frozenset({"POST"}),
+            pattern=re.compile(r"/api/v1/checkin/.*"),
+            limiter=ConcurrencyLimiter(
+                settings.ADMISSION_CHECKIN_CONCURRENCY, settings.ADMISSION_CHECKIN_QUEUE, timeout
+            ),
+        ),
+        AdmissionRule(
+            name="expensive",
+            methods=frozenset({"GET"}),
+            pattern=re.compile(r"/api/v1/studyspots/(search|viewport|\d+/details)?"),
+            limiter=ConcurrencyLimiter(
+                settings.ADMISSION_EXPENSIVE_CONCURRENCY, settings.ADMISSION_EXPENSIVE_QUEUE, timeout
+            ),
+            rate_limiter=TokenBucketLimiter(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST),
+        ),
+    ]
+
+
+def _client_key(scope) -> str:
+    # the remote address (the real client's when running behind a proxy with
+    # uvicorn --proxy-headers); never a client-supplied header, which could be
+    # rotated to get a fresh bucket per request
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, rules: list[AdmissionRule]):
+        self.app = app
+        self.rules = rules
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method, path = scope["method"], scope["path"]
+        rule = next((r for r in self.rules if r.matches(method, path)), None)
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        if rule.rate_limiter is not None:
+            allowed, retry_after = rule.rate_limiter.allow(_client_key(scope))
+            if not allowed:
+                return await _reject(send, 429, "Too many requests", retry_after)
+
+        if not await rule.limiter.acquire():
+            return await _reject(send, 503, "Service busy, please retry", rule.limiter.timeout)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            rule.limiter.release()
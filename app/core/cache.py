@@ -0,0 +1,378 @@
+"""Server-side response cache with tag-based invalidation.
+
+Read endpoints cache their results under a key plus a set of tags. Write
+endpoints invalidate tags, which stamps each tag with the invalidation time
+(its version); entries stored under an older version are treated as misses.
+Tags are kept narrow so a check-in does not flush unrelated listings:
+
+* ``spots`` - spot membership; bumped only when a spot is created
+* ``spot:<id>:<aspect>`` - one aspect (``checkins``, ``reviews``,
+  ``photos``) of one spot, attached to entries that show it
+* ``<aspect>`` - bumped together with every ``spot:<id>:<aspect>``; used by
+  entries whose membership depends on that aspect (e.g. rating filters)
+
+The storage itself is pluggable:
+
+* ``LRUBackend`` - in-process, bounded LRU (default)
+* ``SharedCacheBackend`` - wraps a Redis client (``RESPONSE_CACHE_BACKEND=
+  redis`` with ``RESPONSE_CACHE_URL``) so several workers share entries.
+  ``LocalSharedStore`` is a dict-backed stand-in for tests; it lives in one
+  process and shares nothing.
+
+Stampede protection is two-level: a per-key lock within the process, plus a
+``lock:<key>`` lease in the backend (``SET NX`` with expiry) so that only one
+worker across processes recomputes a key while the others poll for it.
+
+Reads served from a lagging replica must not be cached right after a write,
+or the pre-write result would be stored under the new version; see
+``lag_window`` and ``cached_read``.
+"""
+import fnmatch
+import math
+import pickle
+import uuid
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from app.core.config import settings
+
+
+SPOTS_TAG = "spots"  # spot membership (a spot was added)
+
+# per-spot aspects; see invalidate_spot
+CHECKINS_TAG = "checkins"
+REVIEWS_TAG = "reviews"
+PHOTOS_TAG = "photos"
+
+
+def spot_tag(spot_id: int, aspect: str) -> str:
+    return f"spot:{spot_id}:{aspect}"
+
+
+class CacheBackend:
+    """Minimal key/value storage the response cache is built on."""
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Set ``key`` only if it is absent; returns whether it was set."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def set_counter(self, key: str, value: int) -> None:
+        """Store a non-expiring integer (a tag version)."""
+        raise NotImplementedError
+
+    def counters(self, keys: list[str]) -> list[int]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUBackend(CacheBackend):
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        # counters (tag versions) live outside the LRU so they are never evicted
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key, value, ttl):
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._counters.pop(key, None)
+
+    def set_counter(self, key, value):
+        with self._lock:
+            self._counters[key] = value
+
+    def counters(self, keys):
+        with self._lock:
+            return [self._counters.get(k, 0) for k in keys]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class LocalSharedStore:
+    """Dict-backed stand-in for a Redis client, for tests (``get``/``set``/``mget``/``delete``/``scan_iter``)."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[Optional[float], Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name):
+        item = self._data.get(name)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name):
+        with self._lock:
+            return self._get(name)
+
+    def mget(self, names):
+        with self._lock:
+            return [self._get(name) for name in names]
+
+    def set(self, name, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._get(name) is not None:
+                return None
+            self._data[name] = (time.time() + ex if ex else None, value)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            for name in names:
+                self._data.pop(name, None)
+
+    def scan_iter(self, match):
+        with self._lock:
+            return [name for name in self._data if fnmatch.fnmatchcase(name, match)]
+
+
+class SharedCacheBackend(CacheBackend):
+    """Backend over a Redis-style client; values are pickled."""
+
+    def __init__(self, client, prefix: str = "where2mug:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        # Redis expects whole seconds
+        ex = max(1, int(ttl)) if ttl else None
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ex)
+
+    def add(self, key, value, ttl):
+        ex = max(1, math.ceil(ttl))
+        return bool(self.client.set(self.prefix + key, pickle.dumps(value), ex=ex, nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def set_counter(self, key, value):
+        self.client.set(self.prefix + key, value)
+
+    def counters(self, keys):
+        if not keys:
+            return []
+        return [int(v or 0) for v in self.client.mget([self.prefix + k for k in keys])]
+
+    def clear(self):
+        # only our keys; the Redis database may be shared with other apps
+        for name in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(name)
+
+
+_MISS = object()
+
+
+class ResponseCache:
+    """Tag-aware read-through cache with stampede protection."""
+
+    lease_poll_interval = 0.05
+
+    def __init__(self, backend: CacheBackend, default_ttl: float = 30.0, lease_ttl: float = 10.0):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        # how long one worker may hold a key before others compute it themselves
+        self.lease_ttl = lease_ttl
+        # one lock per key currently being computed; dropped once unused
+        self._key_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._guard = threading.Lock()
+
+    def _tag_versions(self, tags: Iterable[str]) -> dict[str, int]:
+        tags = list(dict.fromkeys(tags))
+        return dict(zip(tags, self.backend.counters([f"tag:{t}" for t in tags])))
+
+    def _lookup(self, key: str) -> Any:
+        entry = self.backend.get(f"resp:{key}")
+        if entry is None:
+            return _MISS
+        versions, value = entry
+        if versions != self._tag_versions(versions):
+            return _MISS
+        return value
+
+    def _await_lease(self, key: str, token: str) -> Any:
+        """Take the backend lease on ``key``, or wait for its holder's value.
+
+        Returns the value if another worker stored it, else ``_MISS`` once the
+        lease is ours or could not be had within ``lease_ttl``.
+        """
+        deadline = time.monotonic() + self.lease_ttl
+        while not self.backend.add(f"lock:{key}", token, self.lease_ttl):
+            if time.monotonic() >= deadline:
+                return _MISS
+            time.sleep(self.lease_poll_interval)
+            value = self._lookup(key)
+            if value is not _MISS:
+                return value
+        return _MISS
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+        value_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+        guard_tags: Iterable[str] = (),
+        lag_window: float = 0.0,
+    ) -> Any:
+        """Return the cached value for ``key`` or compute and store it.
+
+        ``value_tags`` derives further tags from the computed value (e.g. one
+        per spot it contains). Their versions can only be read after
+        ``compute()``, so the value is stored only if ``guard_tags`` - coarser
+        tags bumped alongside them - did not move during the compute.
+
+        With ``lag_window`` (for reads from a replica), the value is returned but
+        not stored if any of its tags was invalidated within that many seconds:
+        the replica may not have the write yet.
+
+        Concurrent misses on the same key wait for a single ``compute()``.
+        """
+        value = self._lookup(key)
+        if value is not _MISS:
+            return value
+
+        with self._guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._key_locks[key] = lock
+
+        with lock:
+            # another request or worker may have filled the entry meanwhile
+            value = self._lookup(key)
+            if value is not _MISS:
+                return value
+            token = uuid.uuid4().hex
+            value = self._await_lease(key, token)
+            if value is not _MISS:
+                return value
+            try:
+                # snapshot versions first so an invalidation during compute wins
+                tags = tuple(tags)
+                guard_tags = tuple(guard_tags)
+                versions = self._tag_versions(tags)
+                guards = self._tag_versions(guard_tags)
+                value = compute()
+                if value_tags is not None:
+                    if self._tag_versions(guard_tags) != guards:
+                        return value
+                    versions.update(self._tag_versions(value_tags(value)))
+                recent = time.time_ns() - lag_window * 1e9
+                if lag_window and any(v > recent for v in versions.values()):
+                    return value
+                self.backend.set(f"resp:{key}", (versions, value), ttl or self.default_ttl)
+                return value
+            finally:
+                # not atomic on Redis, but a lease that expired mid-compute
+                # only costs one extra recompute
+                if self.backend.get(f"lock:{key}") == token:
+                    self.backend.delete(f"lock:{key}")
+
+    def invalidate(self, *tags: str) -> None:
+        # wall-clock versions are comparable across workers and double as the
+        # invalidation time for lag_window
+        version = time.time_ns()
+        for tag in tags:
+            self.backend.set_counter(f"tag:{tag}", version)
+
+    def invalidate_spot(self, aspect: str, *spot_ids: int) -> None:
+        """Invalidate one aspect of the given spots (and the aspect-wide tag)."""
+        self.invalidate(*(spot_tag(i, aspect) for i in spot_ids), aspect)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def make_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return LRUBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "redis":
+        if not settings.RESPONSE_CACHE_URL:
+            raise ValueError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+        # optional dependency, only needed for the shared backend
+        import redis
+        return SharedCacheBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_URL))
+    if name == "local-shared":
+        # tests only: exercises the shared code path within one process
+        return SharedCacheBackend(LocalSharedStore())
+    raise ValueError(f"Unknown response cache backend: {name}")
+
+
+response_cache = ResponseCache(
+    make_backend(settings.RESPONSE_CACHE_BACKEND),
+    default_ttl=settings.RESPONSE_CACHE_TTL,
+)
+
+
+def cached_read(db, key: str, compute: Callable[[], Any], **kwargs) -> Any:
+    """``response_cache.get_or_set`` for a session from ``app.db.session.read_session``.
+
+    Clients pinned to the primary after a write bypass the cache. Replica
+    reads don't fill entries invalidated within READ_YOUR_WRITES_SECONDS.
+    """
+    if db.info.get("pinned"):
+        return compute()
+    lag_window = settings.READ_YOUR_WRITES_SECONDS if db.info.get("replica") else 0.0
+    return response_cache.get_or_set(key, compute, lag_window=lag_window, **kwargs)
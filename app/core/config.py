@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,8 +9,43 @@ class Settings(BaseSettings):
     DB_PORT: str
     DB_NAME: str
 
+    # Full SQLAlchemy URL overriding the DB_* parts (e.g. sqlite:///primary.db)
+    PRIMARY_DATABASE_URL: Optional[str] = None
+    # Optional read replica used by GET routes; unset means reads go to the primary
+    READ_DATABASE_URL: Optional[str] = None
+    # Seconds a client stays pinned to the primary after it writes
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Response cache: "memory" (per-process LRU) or "redis" (shared between
+    # workers; needs the redis package and RESPONSE_CACHE_URL)
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: Optional[str] = None
+    RESPONSE_CACHE_TTL: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Admission control: per-route-class concurrency limits with bounded wait
+    # queues. Keep the expensive limit below the DB pool size (5 + 10 overflow
+    # by default) so check-ins always find a connection.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_EXPENSIVE_CONCURRENCY: int = 4
+    ADMISSION_EXPENSIVE_QUEUE: int = 16
+    ADMISSION_CHECKIN_CONCURRENCY: int = 16
+    ADMISSION_CHECKIN_QUEUE: int = 64
+    # Per-client token bucket for the expensive routes
+    RATE_LIMIT_PER_SECOND: float = 5.0
+    RATE_LIMIT_BURST: int = 20
+
+    # "Similar spots" job (app/jobs/similar_spots.py)
+    SIMILAR_SPOTS_TOP_N: int = 20
+    SIMILAR_SPOTS_DWELL_WEIGHTING: bool = True
+    # Co-visit scores are divided by (1 + distance_km / scale); 0 disables
+    SIMILAR_SPOTS_DISTANCE_SCALE_KM: float = 5.0
+
     @property
     def DATABASE_URL(self) -> str:
+        if self.PRIMARY_DATABASE_URL:
+            return self.PRIMARY_DATABASE_URL
         return f"postgresql+psycopg2://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     
@@ -1,3 +1,15 @@
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+
+def create_tables(bind) -> None:
+    """Create missing tables, plus indexes added to tables that already exist.
+
+    ``create_all`` skips existing tables entirely, so a new index on an old
+    table would otherwise never be created.
+    """
+    Base.metadata.create_all(bind=bind)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -0,0 +1,72 @@
+"""Column-projection read helpers for list endpoints.
+
+These issue ``select()`` on exactly the columns a response needs and map the
+rows straight to dicts, skipping ORM entity construction, the identity map
+and lazy relationship loads.
+"""
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.models.studyspot import StudySpot
+from app.models.user import User
+
+
+REVIEW_COLUMNS = (
+    Review.id,
+    Review.studyspot_id,
+    Review.user_id,
+    Review.rating,
+    Review.comment,
+    Review.created_at,
+    User.name.label("user_name"),
+)
+
+USER_COLUMNS = (User.id, User.name, User.email, User.role)
+
+
+def enum_value(value: Any) -> Any:
+    return value.value if value is not None and hasattr(value, "value") else value
+
+
+def review_rows(
+    db: Session,
+    *criteria,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[dict]:
+    """Reviews (newest first) with the reviewer name joined in from ``User``."""
+    stmt = (
+        select(*REVIEW_COLUMNS)
+        .outerjoin(User, User.id == Review.user_id)
+        .where(*criteria)
+        .order_by(Review.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def user_rows(db: Session, *criteria) -> list[dict]:
+    stmt = select(*USER_COLUMNS).where(*criteria).order_by(User.id)
+    return [
+        {**row, "role": enum_value(row["role"])}
+        for row in db.execute(stmt).mappings()
+    ]
+
+
+def spot_rows(db: Session, fields: Iterable[str], *criteria) -> list[dict]:
+    """StudySpot rows restricted to ``fields`` (column names)."""
+    fields = tuple(fields)
+    stmt = select(*(getattr(StudySpot, f) for f in fields)).where(*criteria).order_by(StudySpot.id)
+    return [spot_dict(row, fields) for row in db.execute(stmt).mappings()]
+
+
+def spot_dict(row, fields: Iterable[str]) -> dict:
+    """Pick ``fields`` from a result mapping, with the status enum as its value."""
+    data = {f: row[f] for f in fields}
+    if "status" in data:
+        data["status"] = enum_value(data["status"])
+    return data
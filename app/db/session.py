@@ -1,14 +1,108 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+def make_engine(url: str):
+    # SQLite connections are shared across FastAPI's worker threads
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, connect_args=connect_args)
+
+
+engine = make_engine(settings.DATABASE_URL)
+# Read replica for GET routes; falls back to the primary when not configured
+read_engine = make_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+# Read-your-writes: a client that just wrote is pinned to the primary for
+# READ_YOUR_WRITES_SECONDS so its next reads don't hit a lagging replica.
+_pinned_until: dict[str, float] = {}
+_pinned_lock = threading.Lock()
+
+
+def pin_to_primary(client: str) -> None:
+    now = time.monotonic()
+    with _pinned_lock:
+        _pinned_until[client] = now + settings.READ_YOUR_WRITES_SECONDS
+        # drop expired pins so the map stays bounded by recent writers
+        for key in [k for k, until in _pinned_until.items() if until <= now]:
+            del _pinned_until[key]
+
+
+def is_pinned(client: Optional[str]) -> bool:
+    if client is None:
+        return False
+    with _pinned_lock:
+        until = _pinned_until.get(client)
+    return until is not None and until > time.monotonic()
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("wrote", False) and session.info.get("client"):
+        pin_to_primary(session.info["client"])
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("Read sessions are read-only; use get_db for writes")
+
+
+def pin_key(request: Request) -> Optional[str]:
+    """Identify the caller for read-your-writes pinning: its ``X-Client-Id``.
+
+    The frontend sends a per-browser id. There is deliberately no fallback to
+    the remote address: everyone behind a shared NAT would be pinned to the
+    primary (and past the response cache) whenever one of them wrote.
+    Rate limiting keys on the address instead, see app.core.admission.
+    """
+    return request.headers.get("X-Client-Id") or None
+
+
+def read_session(client: Optional[str] = None) -> Session:
+    """A session on the replica, or on the primary if the client recently wrote.
+
+    ``info["replica"]`` / ``info["pinned"]`` tell app.core.cache.cached_read how
+    fresh the session's reads are.
+    """
+    if read_engine is engine:
+        return SessionLocal()
+    if is_pinned(client):
+        db = SessionLocal()
+        db.info["pinned"] = True
+        return db
+    db = ReadSessionLocal()
+    db.info["replica"] = True
+    return db
+
 
 # Dependency for FastAPI routes
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["client"] = pin_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency for read-only (GET) routes
+def get_read_db(request: Request):
+    db = read_session(pin_key(request))
     try:
         yield db
     finally:
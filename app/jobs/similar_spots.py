@@ -0,0 +1,210 @@
+"""Build "similar spots" recommendations from check-in co-visitation.
+
+Every user contributes a weight per spot they visited (number of visits,
+optionally boosted by dwell time). Each pair of spots a user visited gets
+``min(weight_a, weight_b)`` in a sparse, symmetric co-visit matrix. The top-N
+neighbours per spot are ranked by that weight, optionally decayed by distance,
+and stored in ``similar_spots`` for a single indexed lookup.
+
+Runs are incremental. Only users with check-ins or check-outs since the last
+run are re-read. Their previous contribution (kept in ``user_spot_weights``)
+is swapped for the new one, and top-N is rebuilt only for spots whose matrix
+rows changed. Re-processing a user is idempotent, so the watermark can
+overlap safely.
+
+    python -m app.jobs.similar_spots [--full]
+"""
+import argparse
+import logging
+import math
+import time
+from collections import defaultdict
+from itertools import combinations
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.checkin import Checkin
+from app.models.studyspot import StudySpot
+from app.models.similarity import UserSpotWeight, SpotCovisit, SimilarSpot, SimilarityState
+
+logger = logging.getLogger(__name__)
+
+MAX_DWELL_HOURS = 4.0        # longer stays don't count for more
+USER_BATCH_SIZE = 500
+# re-read check-outs slightly before the last run to absorb DB/app clock skew
+WATERMARK_OVERLAP_SECONDS = 300.0
+
+
+def visit_weight(checkin_ts, checkout_ts) -> float:
+    if not settings.SIMILAR_SPOTS_DWELL_WEIGHTING or checkin_ts is None or checkout_ts is None:
+        return 1.0
+    dwell_hours = max(0.0, (checkout_ts - checkin_ts) / 3600.0)
+    return 1.0 + min(dwell_hours, MAX_DWELL_HOURS)
+
+
+def user_vectors(db: Session, user_ids: list[int]) -> dict[int, dict[int, float]]:
+    rows = db.query(
+        Checkin.user_id, Checkin.studyspot_id, Checkin.checkin_timestamp, Checkin.checkout_timestamp
+    ).filter(Checkin.user_id.in_(user_ids))
+    vectors: dict[int, dict[int, float]] = defaultdict(lambda: defaultdict(float))
+    for user_id, spot_id, checkin_ts, checkout_ts in rows:
+        vectors[user_id][spot_id] += visit_weight(checkin_ts, checkout_ts)
+    return vectors
+
+
+def pair_weights(vector: dict[int, float]) -> dict[tuple[int, int], float]:
+    return {(a, b): min(vector[a], vector[b]) for a, b in combinations(sorted(vector), 2)}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    R = 6371.0
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * R * math.asin(math.sqrt(a))
+
+
+def _apply_deltas(db: Session, deltas: dict[tuple[int, int], float]) -> set[int]:
+    """Add pair deltas to the co-visit matrix; returns the spots whose rows changed."""
+    touched = {spot for pair in deltas for spot in pair}
+    if not touched:
+        return touched
+    existing = {
+        (row.studyspot_id, row.other_studyspot_id): row
+        for row in db.query(SpotCovisit).filter(
+            SpotCovisit.studyspot_id.in_(touched), SpotCovisit.other_studyspot_id.in_(touched)
+        )
+    }
+    for (a, b), delta in deltas.items():
+        for key in ((a, b), (b, a)):
+            row = existing.get(key)
+            if row is None:
+                if delta > 0:
+                    db.add(SpotCovisit(studyspot_id=key[0], other_studyspot_id=key[1], weight=delta))
+            elif row.weight + delta <= 1e-9:
+                db.delete(row)
+            else:
+                row.weight += delta
+    db.flush()
+    return touched
+
+
+def _rebuild_top_n(db: Session, spot_ids: set[int]) -> None:
+    top_n = settings.SIMILAR_SPOTS_TOP_N
+    scale = settings.SIMILAR_SPOTS_DISTANCE_SCALE_KM
+
+    neighbours: dict[int, list[tuple[int, float]]] = defaultdict(list)
+    for spot_id, other_id, weight in db.query(
+        SpotCovisit.studyspot_id, SpotCovisit.other_studyspot_id, SpotCovisit.weight
+    ).filter(SpotCovisit.studyspot_id.in_(spot_ids)):
+        neighbours[spot_id].append((other_id, weight))
+
+    coords = {}
+    if scale > 0:
+        ids = set(spot_ids) | {other for pairs in neighbours.values() for other, _ in pairs}
+        coords = {
+            spot_id: (lat, lon)
+            for spot_id, lat, lon in db.query(StudySpot.id, StudySpot.latitude, StudySpot.longitude).filter(
+                StudySpot.id.in_(ids)
+            )
+        }
+
+    db.query(SimilarSpot).filter(SimilarSpot.studyspot_id.in_(spot_ids)).delete(synchronize_session=False)
+    for spot_id in spot_ids:
+        scored = []
+        for other_id, weight in neighbours.get(spot_id, []):
+            score = weight
+            if scale > 0 and spot_id in coords and other_id in coords:
+                score /= 1.0 + haversine_km(*coords[spot_id], *coords[other_id]) / scale
+            scored.append((score, other_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        db.add_all(
+            SimilarSpot(studyspot_id=spot_id, rank=rank, similar_studyspot_id=other_id, score=score)
+            for rank, (score, other_id) in enumerate(scored[:top_n], start=1)
+        )
+
+
+def refresh_similar_spots(db: Session, full: bool = False) -> int:
+    """Fold new check-in activity into the recommendations; returns users processed."""
+    state = db.get(SimilarityState, 1)
+    if state is None or full:
+        db.query(SimilarSpot).delete()
+        db.query(SpotCovisit).delete()
+        db.query(UserSpotWeight).delete()
+        if state is None:
+            state = SimilarityState(id=1)
+            db.add(state)
+        state.last_checkin_id = 0
+        state.last_run_timestamp = 0.0
+
+    run_started = time.time()
+    max_checkin_id = db.query(func.max(Checkin.checkin_id)).scalar() or 0
+    since = state.last_run_timestamp - WATERMARK_OVERLAP_SECONDS if state.last_run_timestamp else 0.0
+    user_ids = [
+        user_id
+        for (user_id,) in db.query(Checkin.user_id)
+        .filter(or_(Checkin.checkin_id > state.last_checkin_id, Checkin.checkout_timestamp >= since))
+        .distinct()
+    ]
+
+    touched: set[int] = set()
+    for start in range(0, len(user_ids), USER_BATCH_SIZE):
+        batch = user_ids[start:start + USER_BATCH_SIZE]
+        new_vectors = user_vectors(db, batch)
+        stored: dict[int, dict[int, UserSpotWeight]] = defaultdict(dict)
+        for row in db.query(UserSpotWeight).filter(UserSpotWeight.user_id.in_(batch)):
+            stored[row.user_id][row.studyspot_id] = row
+
+        deltas: dict[tuple[int, int], float] = defaultdict(float)
+        for user_id in batch:
+            rows = stored.get(user_id, {})
+            old = {spot_id: row.weight for spot_id, row in rows.items()}
+            new = dict(new_vectors.get(user_id, {}))
+            if old == new:
+                continue
+            for pair, weight in pair_weights(new).items():
+                deltas[pair] += weight
+            for pair, weight in pair_weights(old).items():
+                deltas[pair] -= weight
+            # store the new vector as this user's applied contribution
+            for spot_id, row in rows.items():
+                if spot_id in new:
+                    row.weight = new[spot_id]
+                else:
+                    db.delete(row)
+            db.add_all(
+                UserSpotWeight(user_id=user_id, studyspot_id=spot_id, weight=weight)
+                for spot_id, weight in new.items()
+                if spot_id not in rows
+            )
+        touched |= _apply_deltas(db, {pair: d for pair, d in deltas.items() if d != 0})
+
+    if touched:
+        _rebuild_top_n(db, touched)
+    state.last_checkin_id = max(state.last_checkin_id, max_checkin_id)
+    state.last_run_timestamp = run_started
+    db.commit()
+    logger.info("similar spots: %d users, %d spots re-ranked", len(user_ids), len(touched))
+    return len(user_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh similar-spot recommendations")
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch instead of incrementally")
+    args = parser.parse_args()
+
+    # register every mapper and make sure the tables exist
+    from app.models import photo, review, user  # noqa: F401
+    from app.db.base import create_tables
+    from app.db.session import engine, SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    create_tables(engine)
+    with SessionLocal() as db:
+        refresh_similar_spots(db, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
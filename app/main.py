@@ -1,16 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.v1 import users_routes, studyspots_routes, reviews_routes, checkin_routes
-from app.db.base import Base
+from app.db.base import create_tables
 from app.db.session import engine
+from app.core.config import settings
+from app.core.admission import AdmissionControlMiddleware, build_rules
 from dotenv import load_dotenv
 from pathlib import Path
 
 import os
 import logging
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Create DB tables and any missing indexes
+create_tables(engine)
 
 app = FastAPI(title="Where2Mug", debug=True)
 
@@ -35,6 +37,11 @@ else:
     # Production — frontend + backend served through Nginx on same origin
     allow_origins = ["*"]
 
+# Shed load on expensive routes before it reaches the DB pool (added before
+# CORS so rejections still carry CORS headers)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, rules=build_rules(settings))
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
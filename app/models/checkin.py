@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -6,9 +6,13 @@ from datetime import datetime
 
 class Checkin(Base):
     __tablename__ = "checkin"
+    __table_args__ = (
+        # a user's open check-ins (checkout_timestamp IS NULL), for userActiveCheckins
+        Index("ix_checkin_user_id_checkout_timestamp", "user_id", "checkout_timestamp"),
+    )
 
     checkin_id = Column(Integer, primary_key=True, index=True)
-    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), nullable=False)
+    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     checkin_timestamp = Column(Float, nullable=True)
     checkout_timestamp = Column(Float, nullable=True)
@@ -8,7 +8,7 @@ class Review(Base):
     __tablename__ = "reviews"
 
     id = Column(Integer, primary_key=True, index=True)
-    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), nullable=False)
+    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     rating = Column(Integer, nullable=False)  # 1-5 stars
     comment = Column(Text, nullable=True)
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.db.base import Base
+
+
+# Tables maintained by app/jobs/similar_spots.py ("people who study here also
+# go to..."). Only SimilarSpot is read by the API.
+
+class UserSpotWeight(Base):
+    """Visit weight of a user at a spot, as last folded into the co-visit matrix."""
+    __tablename__ = "user_spot_weights"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), primary_key=True)
+    weight = Column(Float, nullable=False)
+
+
+class SpotCovisit(Base):
+    """Sparse, symmetric co-visitation matrix (both directions are stored)."""
+    __tablename__ = "spot_covisits"
+
+    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), primary_key=True)
+    other_studyspot_id = Column(Integer, ForeignKey("study_spots.id"), primary_key=True)
+    weight = Column(Float, nullable=False)
+
+
+class SimilarSpot(Base):
+    """Top-N neighbours per spot, ranked; served by /studyspots/{id}/similar."""
+    __tablename__ = "similar_spots"
+
+    studyspot_id = Column(Integer, ForeignKey("study_spots.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    similar_studyspot_id = Column(Integer, ForeignKey("study_spots.id"), nullable=False)
+    score = Column(Float, nullable=False)
+
+
+class SimilarityState(Base):
+    """Single-row watermark of the last similarity run."""
+    __tablename__ = "similarity_state"
+
+    id = Column(Integer, primary_key=True)
+    last_checkin_id = Column(Integer, nullable=False, default=0)
+    last_run_timestamp = Column(Float, nullable=False, default=0.0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Enum
+from sqlalchemy import Column, Integer, String, Float, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -12,6 +12,10 @@ class SpotStatus(enum.Enum):
 
 class StudySpot(Base):
     __tablename__ = "study_spots"
+    __table_args__ = (
+        # bounding-box filters of the map viewport and search
+        Index("ix_study_spots_latitude_longitude", "latitude", "longitude"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -1,9 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, Float, cast, Integer
-from app.schemas.checkin import CheckinOut, CheckinCreate, UserCheckinRequest
+from app.schemas.checkin import (
+    CheckinOut,
+    CheckinCreate,
+    UserCheckinRequest,
+    StudyspotCheckinBatchRequest,
+    StudyspotCheckinStatus,
+    UserActiveCheckinsRequest,
+    UserActiveCheckinsOut,
+    MAX_BATCH_STATUS,
+)
 from app.models.checkin import Checkin
 from app.db.session import get_db
+from app.core.cache import response_cache, CHECKINS_TAG
 
 router = APIRouter()
 
@@ -24,6 +34,7 @@ def checkin_user(checkin: CheckinCreate, db: Session = Depends(get_db)):
     db.add(new_checkin)
     db.commit()
     db.refresh(new_checkin)
+    response_cache.invalidate_spot(CHECKINS_TAG, new_checkin.studyspot_id)
     return new_checkin
 
 @router.post("/signOut", response_model=CheckinOut)
@@ -43,6 +54,7 @@ def checkout_user(checkout: CheckinCreate, db: Session = Depends(get_db)):
     checkin.checkout_timestamp = cast(func.extract("epoch", func.now()), Integer)
     db.commit()
     db.refresh(checkin)
+    response_cache.invalidate_spot(CHECKINS_TAG, checkin.studyspot_id)
     return checkin
 
 @router.post("/userCheckinStatus")
@@ -71,4 +83,34 @@ def get_active_checkins(studyspot_id: int, db: Session = Depends(get_db)):
         )
         .scalar()
     )
-    return {"studyspot_id": studyspot_id, "active_checkins": active_count}
\ No newline at end of file
+    return {"studyspot_id": studyspot_id, "active_checkins": active_count}
+
+@router.post("/studyspotCheckinStatus", response_model=list[StudyspotCheckinStatus])
+def get_active_checkins_batch(request: StudyspotCheckinBatchRequest, db: Session = Depends(get_db)):
+    # dict.fromkeys dedupes while keeping the caller's order
+    spot_ids = list(dict.fromkeys(request.studyspot_ids))
+    counts = dict(
+        db.query(Checkin.studyspot_id, func.count(Checkin.checkin_id))
+        .filter(
+            Checkin.studyspot_id.in_(spot_ids),
+            Checkin.checkout_timestamp.is_(None)
+        )
+        .group_by(Checkin.studyspot_id)
+        .all()
+    )
+    return [{"studyspot_id": i, "active_checkins": counts.get(i, 0)} for i in spot_ids]
+
+@router.post("/userActiveCheckins", response_model=UserActiveCheckinsOut)
+def get_user_active_checkins(request: UserActiveCheckinsRequest, db: Session = Depends(get_db)):
+    rows = (
+        db.query(Checkin.studyspot_id)
+        .filter(
+            Checkin.user_id == request.user_id,
+            Checkin.checkout_timestamp.is_(None)
+        )
+        .distinct()
+        .order_by(Checkin.studyspot_id)
+        .limit(MAX_BATCH_STATUS)
+        .all()
+    )
+    return {"user_id": request.user_id, "studyspot_ids": [spot_id for (spot_id,) in rows]}
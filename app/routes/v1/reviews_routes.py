@@ -7,7 +7,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.reads import review_rows
+from app.core.cache import response_cache, cached_read, spot_tag, REVIEWS_TAG
 from app.models.review import Review
 from app.models.studyspot import StudySpot
 from app.models.user import User
@@ -15,6 +17,20 @@ from app.schemas.review import ReviewCreate, ReviewOut
 
 router = APIRouter()
 
+
+def review_out(review: Review, user_name: str | None) -> dict:
+    """The ``review_rows`` shape for a review already in the session."""
+    return {
+        "id": review.id,
+        "studyspot_id": review.studyspot_id,
+        "user_id": review.user_id,
+        "rating": review.rating,
+        "comment": review.comment,
+        "created_at": review.created_at,
+        "user_name": user_name,
+    }
+
+
 @router.post("/", response_model=ReviewOut)
 def create_review(payload: ReviewCreate, db: Session = Depends(get_db)):
     # Ensure referenced StudySpot exists
@@ -39,96 +55,47 @@ def create_review(payload: ReviewCreate, db: Session = Depends(get_db)):
 
     new_review = Review(**payload.model_dump())
     db.add(new_review)
+    # flush assigns id and created_at; read them before commit expires the row
+    db.flush()
+    out = review_out(new_review, user.name)
     db.commit()
-    db.refresh(new_review)
-
-    # Include reviewer display name in response
-    user_name = None
-    if new_review.user:
-        user_name = getattr(new_review.user, "name", None)
-    else:
-        u = db.query(User).filter(User.id == new_review.user_id).first()
-        user_name = getattr(u, "name", None) if u else None
-
-    return {
-        "id": new_review.id,
-        "studyspot_id": new_review.studyspot_id,
-        "user_id": new_review.user_id,
-        "rating": new_review.rating,
-        "comment": new_review.comment,
-        "created_at": new_review.created_at,
-        "user_name": user_name,
-    }
+    response_cache.invalidate_spot(REVIEWS_TAG, payload.studyspot_id)
+    return out
 
 @router.get("/", response_model=list[ReviewOut])
 def list_reviews(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
 ):
-    reviews = (
-        db.query(Review)
-        .order_by(Review.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-
-    out = []
-    for r in reviews:
-        user_name = getattr(r.user, "name", None) if r.user else None
-        out.append(
-            {
-                "id": r.id,
-                "studyspot_id": r.studyspot_id,
-                "user_id": r.user_id,
-                "rating": r.rating,
-                "comment": r.comment,
-                "created_at": r.created_at,
-                "user_name": user_name,
-            }
-        )
-    return out
+    return review_rows(db, limit=limit, offset=offset)
 
 @router.get("/by-spot/{spot_id}", response_model=list[ReviewOut])
 def list_reviews_for_spot(
     spot_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
 ):
+    return cached_read(
+        db,
+        f"reviews:by-spot:{spot_id}:{limit}:{offset}",
+        lambda: _list_reviews_for_spot(db, spot_id, limit, offset),
+        tags=(spot_tag(spot_id, REVIEWS_TAG),),
+    )
+
+
+def _list_reviews_for_spot(db: Session, spot_id: int, limit: int, offset: int) -> list[dict]:
     # 404 if spot doesn’t exist (optional but nice)
     if not db.query(StudySpot).filter(StudySpot.id == spot_id).first():
         raise HTTPException(status_code=404, detail="Study spot not found")
 
-    reviews = (
-        db.query(Review)
-        .where(Review.studyspot_id == spot_id)
-        .order_by(Review.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    out = []
-    for r in reviews:
-        user_name = getattr(r.user, "name", None) if r.user else None
-        out.append(
-            {
-                "id": r.id,
-                "studyspot_id": r.studyspot_id,
-                "user_id": r.user_id,
-                "rating": r.rating,
-                "comment": r.comment,
-                "created_at": r.created_at,
-                "user_name": user_name,
-            }
-        )
-    return out
+    return review_rows(db, Review.studyspot_id == spot_id, limit=limit, offset=offset)
 
 @router.get("/by-user/{user_id}", response_model=list[ReviewOut])
 def list_reviews_by_user(
     user_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
 ):
@@ -136,29 +103,7 @@ def list_reviews_by_user(
     if not db.query(User).filter(User.id == user_id).first():
         raise HTTPException(status_code=404, detail="User not found")
 
-    reviews = (
-        db.query(Review)
-        .where(Review.user_id == user_id)
-        .order_by(Review.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    out = []
-    for r in reviews:
-        user_name = getattr(r.user, "name", None) if r.user else None
-        out.append(
-            {
-                "id": r.id,
-                "studyspot_id": r.studyspot_id,
-                "user_id": r.user_id,
-                "rating": r.rating,
-                "comment": r.comment,
-                "created_at": r.created_at,
-                "user_name": user_name,
-            }
-        )
-    return out
+    return review_rows(db, Review.user_id == user_id, limit=limit, offset=offset)
 
 @router.put("/{review_id}", response_model=ReviewOut)
 def update_review(
@@ -175,30 +120,28 @@ def update_review(
         if not db.query(StudySpot).filter(StudySpot.id == payload.studyspot_id).first():
             raise HTTPException(status_code=404, detail="Study spot not found")
     if payload.user_id != review.user_id:
-        if not db.query(User).filter(User.id == payload.user_id).first():
+        user = db.query(User).filter(User.id == payload.user_id).first()
+        if not user:
             raise HTTPException(status_code=404, detail="User not found")
+    else:
+        user = review.user
 
+    old_spot_id = review.studyspot_id
     for k, v in payload.model_dump().items():
         setattr(review, k, v)
+    db.flush()
+    out = review_out(review, user.name if user else None)
     db.commit()
-    db.refresh(review)
-
-    user_name = getattr(review.user, "name", None) if review.user else None
-    return {
-        "id": review.id,
-        "studyspot_id": review.studyspot_id,
-        "user_id": review.user_id,
-        "rating": review.rating,
-        "comment": review.comment,
-        "created_at": review.created_at,
-        "user_name": user_name,
-    }
+    response_cache.invalidate_spot(REVIEWS_TAG, old_spot_id, payload.studyspot_id)
+    return out
 
 @router.delete("/{review_id}", status_code=204)
 def delete_review(review_id: int = Path(..., ge=1), db: Session = Depends(get_db)):
     review = db.query(Review).filter(Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
+    spot_id = review.studyspot_id
     db.delete(review)
     db.commit()
+    response_cache.invalidate_spot(REVIEWS_TAG, spot_id)
     return None
@@ -3,20 +3,34 @@ import math
 import os
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 import boto3
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-
-from app.schemas.studyspot import StudySpotCreate, StudySpotOut, PhotoOut
+from sqlalchemy import and_, case, func, or_, select
+
+from app.schemas.studyspot import (
+    StudySpotCreate,
+    StudySpotOut,
+    StudySpotSparseOut,
+    StudySpotDetailOut,
+    SimilarSpotOut,
+    PhotoOut,
+    SpotCluster,
+    SpotMarker,
+    ViewportOut,
+)
 from app.models.studyspot import StudySpot
 from app.models.review import Review
 from app.models.checkin import Checkin
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, read_session, pin_key
+from app.db.reads import spot_rows, spot_dict, review_rows, enum_value
+from app.core.cache import response_cache, cached_read, spot_tag, SPOTS_TAG, CHECKINS_TAG, REVIEWS_TAG, PHOTOS_TAG
 from sqlalchemy import func
 from app.models.photo import Photo
+from app.models.similarity import SimilarSpot
 
 router = APIRouter()
 
@@ -74,133 +88,423 @@ def create_study_spot(spot: StudySpotCreate, db: Session = Depends(get_db)):
     db.add(new_spot)
     db.commit()
     db.refresh(new_spot)
+    response_cache.invalidate(SPOTS_TAG)
     return new_spot
 
-@router.get("/", response_model=list[StudySpotOut])
-def list_study_spots(db: Session = Depends(get_db)):
-    spots = db.query(StudySpot).all()
-    result = []
-    for spot in spots:
-        active_count = (
-            db.query(func.count(Checkin.checkin_id))
-            .filter(Checkin.studyspot_id == spot.id, Checkin.checkout_timestamp.is_(None))
-            .scalar()
+# Sparse fieldsets: ``fields=`` picks StudySpot columns, ``include=`` opts into
+# the expensive sub-loads. Only what is requested gets queried.
+SPOT_FIELDS = ("id", "name", "place_id", "latitude", "longitude", "status", "description")
+SPOT_INCLUDES = ("photos", "active_checkins", "avg_rating")
+
+# cache tag of the data behind each include (see app.core.cache)
+INCLUDE_TAGS = {"photos": PHOTOS_TAG, "active_checkins": CHECKINS_TAG, "avg_rating": REVIEWS_TAG}
+# longer cached lists depend on the aspect-wide tags instead, so a cache hit
+# doesn't have to check one tag per listed spot
+PER_SPOT_TAGS_MAX = 50
+
+FIELDS_QUERY = Query(None, description=f"Comma-separated subset of: {', '.join(SPOT_FIELDS)}")
+INCLUDE_QUERY = Query(None, description=f"Comma-separated subset of: {', '.join(SPOT_INCLUDES)}")
+
+
+def parse_fields(fields: Optional[str]) -> tuple[str, ...]:
+    if fields is None:
+        return SPOT_FIELDS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(SPOT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    # id is always returned so clients can key the results
+    return tuple(f for f in SPOT_FIELDS if f == "id" or f in requested)
+
+
+def parse_include(include: Optional[str], default: tuple[str, ...]) -> frozenset[str]:
+    if include is None:
+        return frozenset(default)
+    requested = {i.strip() for i in include.split(",") if i.strip()}
+    unknown = requested - set(SPOT_INCLUDES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return frozenset(requested)
+
+
+def include_tags(includes: frozenset[str]) -> tuple[str, ...]:
+    return tuple(INCLUDE_TAGS[i] for i in sorted(includes))
+
+
+def spot_list_tags(includes: frozenset[str]):
+    """``value_tags`` for a cached spot list: the included aspects of each listed spot.
+
+    Lists longer than PER_SPOT_TAGS_MAX (e.g. the full listing) use the
+    aspect-wide tags instead.
+    """
+    aspects = include_tags(includes)
+
+    def tags(spots: list[dict]) -> list[str]:
+        if len(spots) > PER_SPOT_TAGS_MAX:
+            return list(aspects)
+        return [spot_tag(spot["id"], aspect) for spot in spots for aspect in aspects]
+    return tags
+
+
+def load_active_checkins(db: Session, spot_ids: Optional[list[int]] = None) -> dict[int, int]:
+    """Active check-in counts per spot in one grouped query (all spots if ids is None)."""
+    query = db.query(Checkin.studyspot_id, func.count(Checkin.checkin_id)).filter(
+        Checkin.checkout_timestamp.is_(None)
+    )
+    if spot_ids is not None:
+        query = query.filter(Checkin.studyspot_id.in_(spot_ids))
+    return dict(query.group_by(Checkin.studyspot_id).all())
+
+
+def load_avg_ratings(db: Session, spot_ids: Optional[list[int]] = None) -> dict[int, float]:
+    query = db.query(Review.studyspot_id, func.avg(Review.rating))
+    if spot_ids is not None:
+        query = query.filter(Review.studyspot_id.in_(spot_ids))
+    return {spot_id: float(avg) for spot_id, avg in query.group_by(Review.studyspot_id).all()}
+
+
+def load_photos(
+    db: Session,
+    spot_ids: Optional[list[int]] = None,
+    newest_first: bool = False,
+) -> dict[int, list[PhotoOut]]:
+    """Photos per spot with presigned GET urls, primary first (or newest first)."""
+    query = db.query(Photo.id, Photo.studyspot_id, Photo.key, Photo.is_primary, Photo.created_at)
+    if spot_ids is not None:
+        query = query.filter(Photo.studyspot_id.in_(spot_ids))
+    if newest_first:
+        query = query.order_by(Photo.created_at.desc(), Photo.is_primary.desc())
+    else:
+        query = query.order_by(Photo.is_primary.desc(), Photo.created_at.desc())
+    photos: dict[int, list[PhotoOut]] = {}
+    for photo_id, spot_id, key, is_primary, created_at in query:
+        photos.setdefault(spot_id, []).append(
+            PhotoOut(id=photo_id, url=presigned_get_url(key), key=key, is_primary=bool(is_primary), created_at=created_at)
         )
-        spot_data = StudySpotOut.from_orm(spot)
-        spot_data.active_checkins = active_count
-        # attach photos with presigned urls (newest first)
-        photos = db.query(Photo).filter(Photo.studyspot_id == spot.id).order_by(Photo.created_at.desc(), Photo.is_primary.desc()).all()
-        photos_out = [PhotoOut.from_orm(p) for p in photos]
-        # replace stored url with presigned GET url (PhotoOut.from_orm uses DB values; override url)
-        for photo_model in photos_out:
-            # find corresponding Photo DB object to get key
-            # We assume the DB Photo has same id ordering; fetch key via DB query
-            db_photo = next((x for x in photos if x.id == photo_model.id), None)
-            if db_photo:
-                photo_model.url = presigned_get_url(db_photo.key)
-        spot_data.photos = photos_out or None
-        result.append(spot_data)
-
-    return result
-
-
-
-def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    # Returns distance in kilometers between two points
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    return photos
+
+
+def attach_includes(
+    db: Session,
+    spots: list[dict],
+    include: frozenset[str],
+    spot_ids: Optional[list[int]] = None,
+    newest_first: bool = False,
+    photos_or_none: bool = True,
+) -> list[dict]:
+    """Run only the requested sub-loads and merge them into the spot dicts.
+
+    ``newest_first`` and ``photos_or_none`` keep each endpoint's existing photo
+    order and its ``null`` (rather than ``[]``) for spots without photos.
+    """
+    if not spots:
+        return spots
+    if "active_checkins" in include:
+        counts = load_active_checkins(db, spot_ids)
+        for spot in spots:
+            spot["active_checkins"] = counts.get(spot["id"], 0)
+    if "avg_rating" in include:
+        ratings = load_avg_ratings(db, spot_ids)
+        for spot in spots:
+            spot["avg_rating"] = ratings.get(spot["id"])
+    if "photos" in include:
+        photos = load_photos(db, spot_ids, newest_first)
+        for spot in spots:
+            spot["photos"] = photos.get(spot["id"]) or (None if photos_or_none else [])
+    return spots
+
+
+@router.get(
+    "/",
+    response_model=list[StudySpotSparseOut],
+    response_model_exclude_unset=True,
+)
+def list_study_spots(
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db),
+):
+    columns = parse_fields(fields)
+    includes = parse_include(include, default=("photos", "active_checkins"))
+    return cached_read(
+        db,
+        f"studyspots:list:{','.join(columns)}:{','.join(sorted(includes))}",
+        lambda: _list_study_spots(db, columns, includes),
+        tags=(SPOTS_TAG,),
+        value_tags=spot_list_tags(includes),
+        guard_tags=include_tags(includes),
+    )
+
+
+def _list_study_spots(db: Session, columns: tuple[str, ...], includes: frozenset[str]) -> list[dict]:
+    spots = spot_rows(db, columns)
+    # every spot is listed, so the sub-loads don't need an id filter
+    return attach_includes(db, spots, includes, newest_first=True)
 
 
-@router.get("/search", response_model=list[StudySpotOut])
+
+def haversine_km_sql(lat: float, lon: float):
+    """SQL expression for the great-circle distance (km) from (lat, lon) to each spot."""
+    R = 6371.0
+    half_dlat = func.radians(StudySpot.latitude - lat) / 2
+    half_dlon = func.radians(StudySpot.longitude - lon) / 2
+    a = func.power(func.sin(half_dlat), 2) + math.cos(math.radians(lat)) * func.cos(
+        func.radians(StudySpot.latitude)
+    ) * func.power(func.sin(half_dlon), 2)
+    # rounding can push a just past 1 for antipodal points, where asin(sqrt(a))
+    # raises on Postgres; CASE rather than LEAST so SQLite runs it too
+    a = case((a > 1.0, 1.0), else_=a)
+    return 2 * R * func.asin(func.sqrt(a))
+
+
+@router.get(
+    "/search",
+    response_model=list[StudySpotSparseOut],
+    response_model_exclude_unset=True,
+)
 def search_study_spots(
     lat: Optional[float] = Query(None, description="Latitude of user location"),
     lon: Optional[float] = Query(None, description="Longitude of user location"),
     radius_km: float = Query(1.0, description="Search radius in kilometers"),
     min_avg_rating: Optional[int] = Query(None, ge=1, le=5, description="Minimum average rating (1-5)"),
     min_active_checkins: Optional[int] = Query(None, description="Minimum number of active check-ins (e.g. 10,20,50)"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db),
 ):
     """Search study spots with optional location/radius filtering and optional minimum average rating."""
-    # Build base query: study spots with aggregated average rating
-    query = db.query(StudySpot, func.avg(Review.rating).label("avg_rating")).outerjoin(Review).group_by(StudySpot.id)
+    columns = parse_fields(fields)
+    includes = parse_include(include, default=SPOT_INCLUDES)
+    key = (
+        f"studyspots:search:{lat}:{lon}:{radius_km}:{min_avg_rating}:{min_active_checkins}"
+        f":{','.join(columns)}:{','.join(sorted(includes))}"
+    )
+    # which spots match depends on every spot's rating/check-ins when filtering on them
+    tags = [SPOTS_TAG]
+    if min_avg_rating is not None:
+        tags.append(REVIEWS_TAG)
+    if min_active_checkins is not None and min_active_checkins > 0:
+        tags.append(CHECKINS_TAG)
+    return cached_read(
+        db,
+        key,
+        lambda: _search_study_spots(
+            db, lat, lon, radius_km, min_avg_rating, min_active_checkins, columns, includes
+        ),
+        tags=tags,
+        value_tags=spot_list_tags(includes),
+        guard_tags=include_tags(includes),
+    )
+
+
+def _search_study_spots(
+    db: Session,
+    lat: Optional[float],
+    lon: Optional[float],
+    radius_km: float,
+    min_avg_rating: Optional[int],
+    min_active_checkins: Optional[int],
+    columns: tuple[str, ...],
+    includes: frozenset[str],
+) -> list[dict]:
+    """Run the whole search as one statement; only surviving rows are hydrated."""
+    has_location = lat is not None and lon is not None
+    stmt = select(*(getattr(StudySpot, c) for c in columns))
+
+    # Average rating per spot; HAVING drops spots below the threshold (and,
+    # through the inner join, spots without any reviews)
+    if "avg_rating" in includes or min_avg_rating is not None:
+        avg_rating = func.avg(Review.rating)
+        ratings = select(Review.studyspot_id, avg_rating.label("avg_rating")).group_by(Review.studyspot_id)
+        if min_avg_rating is not None:
+            ratings = ratings.having(avg_rating >= min_avg_rating)
+        ratings = ratings.subquery()
+        stmt = stmt.add_columns(ratings.c.avg_rating).join(
+            ratings, ratings.c.studyspot_id == StudySpot.id, isouter=min_avg_rating is None
+        )
 
-    # If lat/lon provided, first apply a bounding box to limit candidates
-    candidates = []
-    if lat is not None and lon is not None:
-        # approximate degree deltas
+    # Active check-ins per spot as a joined aggregate subquery
+    if "active_checkins" in includes or min_active_checkins is not None:
+        active_count = func.count(Checkin.checkin_id)
+        active = (
+            select(Checkin.studyspot_id, active_count.label("active_checkins"))
+            .where(Checkin.checkout_timestamp.is_(None))
+            .group_by(Checkin.studyspot_id)
+        )
+        # a threshold of 0 or less keeps spots with no check-ins
+        filter_active = min_active_checkins is not None and min_active_checkins > 0
+        if filter_active:
+            active = active.having(active_count >= min_active_checkins)
+        active = active.subquery()
+        stmt = stmt.add_columns(func.coalesce(active.c.active_checkins, 0).label("active_checkins")).join(
+            active, active.c.studyspot_id == StudySpot.id, isouter=not filter_active
+        )
+
+    if has_location:
+        distance = haversine_km_sql(lat, lon).label("distance_km")
+        # bounding box first so ix_study_spots_latitude_longitude can narrow
+        # candidates; wrapped like a viewport when it crosses the antimeridian
         lat_delta = radius_km / 110.574
         lon_delta = radius_km / (111.320 * max(0.000001, math.cos(math.radians(lat))))
-        query = query.filter(
-            StudySpot.latitude >= lat - lat_delta,
-            StudySpot.latitude <= lat + lat_delta,
-            StudySpot.longitude >= lon - lon_delta,
-            StudySpot.longitude <= lon + lon_delta,
+        stmt = (
+            stmt.add_columns(distance)
+            .where(
+                StudySpot.latitude >= lat - lat_delta,
+                StudySpot.latitude <= lat + lat_delta,
+                or_(*(
+                    and_(StudySpot.longitude >= west, StudySpot.longitude <= east)
+                    for west, east in lon_ranges(lon - lon_delta, lon + lon_delta)
+                )),
+                distance <= radius_km,
+            )
+            .order_by(distance, StudySpot.id)
         )
-
-    results = query.all()
+    else:
+        stmt = stmt.order_by(StudySpot.id)
 
     out: list[dict] = []
-    for spot, avg_rating in results:
-        # compute active checkins for this spot
-        try:
-            active_count = (
-                db.query(func.count(Checkin.checkin_id))
-                .filter(Checkin.studyspot_id == spot.id, Checkin.checkout_timestamp.is_(None))
-                .scalar()
-            )
-        except Exception:
-            active_count = 0
-        # compute accurate distance if location provided
-        distance = None
-        if lat is not None and lon is not None:
-            distance = haversine_km(lat, lon, spot.latitude, spot.longitude)
-            if distance is None:
-                continue
-            if distance > radius_km:
-                continue
-
-        avg = float(avg_rating) if avg_rating is not None else None
-        if min_avg_rating is not None:
-            # treat None avg as 0 (exclude) -- only include if avg exists and meets threshold
-            if avg is None or avg < float(min_avg_rating):
-                continue
-
-        if min_active_checkins is not None:
-            # exclude spots with fewer active checkins than requested
-            if (active_count or 0) < int(min_active_checkins):
-                continue
-
-        out.append({
-            "id": spot.id,
-            "name": spot.name,
-            "place_id": spot.place_id,
-            "latitude": spot.latitude,
-            "longitude": spot.longitude,
-            "status": spot.status,
-            "description": spot.description,
-            "avg_rating": avg,
-            "distance_km": distance,
-            "active_checkins": int(active_count or 0),
-            # include photos (primary first)
-            "photos": [
-                (lambda ph: (setattr(ph, 'url', presigned_get_url(ph.key)) or ph))(
-                    PhotoOut.from_orm(p)
-                )
-                for p in db.query(Photo).filter(Photo.studyspot_id == spot.id).order_by(Photo.is_primary.desc(), Photo.created_at.desc()).all()
-            ],
-        })
-
-    # sort by distance if location provided
-    if lat is not None and lon is not None:
-        out.sort(key=lambda s: (s["distance_km"] is None, s["distance_km"]))
+    for row in db.execute(stmt).mappings():
+        spot = spot_dict(row, columns)
+        if has_location:
+            spot["distance_km"] = row["distance_km"]
+        if "avg_rating" in includes:
+            spot["avg_rating"] = float(row["avg_rating"]) if row["avg_rating"] is not None else None
+        if "active_checkins" in includes:
+            spot["active_checkins"] = row["active_checkins"]
+        out.append(spot)
+
+    # include photos (primary first) only for the spots that survived filtering
+    if "photos" in includes:
+        attach_includes(db, out, frozenset({"photos"}), [s["id"] for s in out], photos_or_none=False)
 
     return out
 
 
+# Map viewport: at low zoom spots are grouped into grid clusters, at high zoom
+# individual lightweight markers (no photos) are returned.
+CLUSTER_MAX_ZOOM = 14           # zoom at which clustering stops
+CLUSTER_CELLS_PER_TILE = 4      # grid cells per 256px tile (~64px cells)
+VIEWPORT_CACHE_TTL = 60.0       # seconds a precomputed zoom band stays fresh
+
+
+def cluster_cell_size(zoom: int) -> float:
+    """Size in degrees of a clustering grid cell at the given zoom level."""
+    return 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+
+
+def lon_ranges(min_lon: float, max_lon: float) -> list[tuple[float, float]]:
+    """Split a viewport's longitudes into ranges within [-180, 180].
+
+    Map bounds may be unwrapped (beyond +/-180 when zoomed out) or cross the
+    antimeridian (``min_lon > max_lon``); the latter yields two ranges.
+    """
+    span = max_lon - min_lon if min_lon <= max_lon else max_lon + 360 - min_lon
+    if span >= 360:
+        return [(-180.0, 180.0)]
+    west = (min_lon + 180) % 360 - 180
+    east = west + span
+    if east <= 180:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east - 360)]
+
+
+def _build_clusters(db: Session, zoom: int) -> dict[tuple[int, int], SpotCluster]:
+    cell = cluster_cell_size(zoom)
+    rows = (
+        db.query(StudySpot.latitude, StudySpot.longitude, func.avg(Review.rating))
+        .outerjoin(Review, Review.studyspot_id == StudySpot.id)
+        .group_by(StudySpot.id)
+        .all()
+    )
+
+    # cell -> [count, lat_sum, lon_sum, max_rating]
+    buckets: dict[tuple[int, int], list] = {}
+    for lat, lon, rating in rows:
+        key = (math.floor(lon / cell), math.floor(lat / cell))
+        bucket = buckets.setdefault(key, [0, 0.0, 0.0, None])
+        bucket[0] += 1
+        bucket[1] += lat
+        bucket[2] += lon
+        if rating is not None and (bucket[3] is None or rating > bucket[3]):
+            bucket[3] = float(rating)
+
+    return {
+        key: SpotCluster(
+            count=count,
+            latitude=lat_sum / count,
+            longitude=lon_sum / count,
+            max_rating=max_rating,
+        )
+        for key, (count, lat_sum, lon_sum, max_rating) in buckets.items()
+    }
+
+
+def get_zoom_clusters(db: Session, zoom: int) -> dict[tuple[int, int], SpotCluster]:
+    """Return the cluster grid for a zoom band, rebuilding it when stale."""
+    return cached_read(
+        db,
+        f"studyspots:viewport:{zoom}",
+        lambda: _build_clusters(db, zoom),
+        # clusters carry counts and the best rating, nothing check-in related
+        tags=(SPOTS_TAG, REVIEWS_TAG),
+        ttl=VIEWPORT_CACHE_TTL,
+    )
+
+
+@router.get("/viewport", response_model=ViewportOut)
+def get_viewport(
+    min_lat: float = Query(..., ge=-90, le=90, description="South edge of the viewport"),
+    min_lon: float = Query(..., description="West edge of the viewport (may be unwrapped)"),
+    max_lat: float = Query(..., ge=-90, le=90, description="North edge of the viewport"),
+    max_lon: float = Query(..., description="East edge of the viewport (may be unwrapped)"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum markers returned at high zoom"),
+    db: Session = Depends(get_read_db),
+):
+    """Return clusters (low zoom) or individual markers (high zoom) inside a bounding box."""
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+    ranges = lon_ranges(min_lon, max_lon)
+
+    if zoom < CLUSTER_MAX_ZOOM:
+        clusters = get_zoom_clusters(db, zoom)
+        cell = cluster_cell_size(zoom)
+        x_ranges = [(math.floor(west / cell), math.floor(east / cell)) for west, east in ranges]
+        y0, y1 = math.floor(min_lat / cell), math.floor(max_lat / cell)
+        visible = [
+            cluster
+            for (x, y), cluster in clusters.items()
+            if y0 <= y <= y1 and any(x0 <= x <= x1 for x0, x1 in x_ranges)
+        ]
+        return ViewportOut(zoom=zoom, clustered=True, clusters=visible)
+
+    # spots via the (latitude, longitude) index, then ratings for just those
+    rows = (
+        db.query(StudySpot.id, StudySpot.name, StudySpot.latitude, StudySpot.longitude, StudySpot.status)
+        .filter(
+            StudySpot.latitude >= min_lat,
+            StudySpot.latitude <= max_lat,
+            or_(*(and_(StudySpot.longitude >= west, StudySpot.longitude <= east) for west, east in ranges)),
+        )
+        .order_by(StudySpot.id)
+        .limit(limit)
+        .all()
+    )
+    ratings = load_avg_ratings(db, [row.id for row in rows]) if rows else {}
+    markers = [
+        SpotMarker(
+            id=spot_id,
+            name=name,
+            latitude=lat,
+            longitude=lon,
+            status=enum_value(status),
+            avg_rating=ratings.get(spot_id),
+        )
+        for spot_id, name, lat, lon, status in rows
+    ]
+    return ViewportOut(zoom=zoom, clustered=False, spots=markers)
+
+
 @router.post("/{spot_id}/photos/presign")
 def presign_photo_upload(spot_id: int, req: PresignRequest, db: Session = Depends(get_db)):
     # Validate spot exists
@@ -276,21 +580,130 @@ def notify_photo_saved(spot_id: int, payload: PhotoNotify, db: Session = Depends
         except Exception:
             db.rollback()
 
+    response_cache.invalidate_spot(PHOTOS_TAG, spot_id)
     return {"id": new_photo.id, "url": new_photo.url, "key": new_photo.key, "is_primary": new_photo.is_primary}
 
 
-@router.get("/{spot_id}", response_model=StudySpotOut)
-def get_study_spot(spot_id: int, db: Session = Depends(get_db)):
-    spot = db.query(StudySpot).filter(StudySpot.id == spot_id).first()
-    if not spot:
+# Worker pool for the independent sub-queries of the composite detail endpoint;
+# each task runs on its own session so they can hit the database concurrently.
+_detail_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="spot-detail")
+
+
+def _in_session(client, fn, *args):
+    with read_session(client) as db:
+        return fn(db, *args)
+
+
+def _rating_summary(db: Session, spot_id: int) -> tuple[Optional[float], int]:
+    avg, count = (
+        db.query(func.avg(Review.rating), func.count(Review.id))
+        .filter(Review.studyspot_id == spot_id)
+        .one()
+    )
+    return (float(avg) if avg is not None else None), count
+
+
+def _user_checked_in(db: Session, spot_id: int, user_id: int) -> bool:
+    count = (
+        db.query(func.count(Checkin.checkin_id))
+        .filter(
+            Checkin.studyspot_id == spot_id,
+            Checkin.user_id == user_id,
+            Checkin.checkout_timestamp.is_(None),
+        )
+        .scalar()
+    )
+    return count > 0
+
+
+@router.get(
+    "/{spot_id}/details",
+    response_model=StudySpotDetailOut,
+    response_model_exclude_unset=True,
+)
+def get_study_spot_details(
+    spot_id: int,
+    request: Request,
+    user_id: Optional[int] = Query(None, description="Include this user's check-in status"),
+    review_limit: int = Query(20, ge=1, le=1000, description="Size of the first page of reviews"),
+):
+    """Spot, photos, first page of reviews, rating summary and check-in status in one call."""
+    client = pin_key(request)
+
+    def submit(fn, *args):
+        return _detail_pool.submit(_in_session, client, fn, *args)
+
+    spot = submit(cached_study_spot, spot_id, SPOT_FIELDS, frozenset({"photos"}))
+    reviews = submit(lambda db: review_rows(db, Review.studyspot_id == spot_id, limit=review_limit))
+    rating = submit(_rating_summary, spot_id)
+    active = submit(lambda db: load_active_checkins(db, [spot_id]).get(spot_id, 0))
+    checked_in = submit(_user_checked_in, spot_id, user_id) if user_id is not None else None
+
+    # raises the 404 from the spot lookup, if any
+    spot_out = spot.result()
+    avg_rating, review_count = rating.result()
+    return {
+        "spot": spot_out,
+        "reviews": reviews.result(),
+        "avg_rating": avg_rating,
+        "review_count": review_count,
+        "active_checkins": active.result(),
+        "is_user_checkin": checked_in.result() if checked_in is not None else None,
+    }
+
+
+@router.get("/{spot_id}/similar", response_model=list[SimilarSpotOut])
+def list_similar_spots(
+    spot_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Spots frequently visited by the same people, precomputed by app.jobs.similar_spots."""
+    stmt = (
+        select(
+            StudySpot.id,
+            StudySpot.name,
+            StudySpot.latitude,
+            StudySpot.longitude,
+            SimilarSpot.score,
+        )
+        .join(StudySpot, StudySpot.id == SimilarSpot.similar_studyspot_id)
+        .where(SimilarSpot.studyspot_id == spot_id)
+        .order_by(SimilarSpot.rank)
+        .limit(limit)
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+@router.get(
+    "/{spot_id}",
+    response_model=StudySpotSparseOut,
+    response_model_exclude_unset=True,
+)
+def get_study_spot(
+    spot_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db),
+):
+    columns = parse_fields(fields)
+    includes = parse_include(include, default=("photos",))
+    return cached_study_spot(db, spot_id, columns, includes)
+
+
+def cached_study_spot(db: Session, spot_id: int, columns: tuple[str, ...], includes: frozenset[str]) -> dict:
+    return cached_read(
+        db,
+        f"studyspots:{spot_id}:{','.join(columns)}:{','.join(sorted(includes))}",
+        lambda: _get_study_spot(db, spot_id, columns, includes),
+        tags=[spot_tag(spot_id, aspect) for aspect in include_tags(includes)],
+    )
+
+
+def _get_study_spot(db: Session, spot_id: int, columns: tuple[str, ...], includes: frozenset[str]) -> dict:
+    rows = spot_rows(db, columns, StudySpot.id == spot_id)
+    if not rows:
         raise HTTPException(status_code=404, detail="Study spot not found")
-    spot_out = StudySpotOut.from_orm(spot)
-    # attach photos with presigned urls
-    photos = db.query(Photo).filter(Photo.studyspot_id == spot.id).order_by(Photo.is_primary.desc(), Photo.created_at.desc()).all()
-    photos_out = [PhotoOut.from_orm(p) for p in photos]
-    for photo_model in photos_out:
-        db_photo = next((x for x in photos if x.id == photo_model.id), None)
-        if db_photo:
-            photo_model.url = presigned_get_url(db_photo.key)
-    spot_out.photos = photos_out or None
-    return spot_out
+    spot = rows[0]
+    attach_includes(db, [spot], includes, [spot_id])
+    return spot
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserOut, UserLogin
 from app.models.user import User
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.reads import user_rows
 
 router = APIRouter()
 
@@ -18,8 +19,8 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 @router.get("/", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+def list_users(db: Session = Depends(get_read_db)):
+    return user_rows(db)
 
 @router.post("/login", response_model=UserOut)
 def login(user_login: UserLogin, db: Session = Depends(get_db)):
@@ -20,4 +20,22 @@ class CheckinOut(CheckinBase):
 
 class UserCheckinRequest(BaseModel):
     studyspot_id: int
-    user_id: int
\ No newline at end of file
+    user_id: int
+
+
+# Upper bound on ids accepted (and rows returned) by the batch status endpoints
+MAX_BATCH_STATUS = 200
+
+class StudyspotCheckinBatchRequest(BaseModel):
+    studyspot_ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_STATUS)
+
+class StudyspotCheckinStatus(BaseModel):
+    studyspot_id: int
+    active_checkins: int
+
+class UserActiveCheckinsRequest(BaseModel):
+    user_id: int
+
+class UserActiveCheckinsOut(BaseModel):
+    user_id: int
+    studyspot_ids: list[int]
@@ -3,6 +3,8 @@ from enum import Enum
 from typing import Optional
 from datetime import datetime
 
+from app.schemas.review import ReviewOut
+
 class SpotStatus(str, Enum):
     pending = "pending"
     active = "active"
@@ -45,3 +47,62 @@ class PhotoOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# StudySpotOut with every attribute optional, for responses shaped by the
+# fields=/include= query parameters (unrequested keys are omitted)
+class StudySpotSparseOut(BaseModel):
+    id: int
+    name: str | None = None
+    place_id: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    status: SpotStatus | None = None
+    description: str | None = None
+    avg_rating: float | None = None
+    distance_km: float | None = None
+    active_checkins: int | None = None
+    photos: list[PhotoOut] | None = None
+
+
+# Everything the spot details page needs, gathered in one response
+class StudySpotDetailOut(BaseModel):
+    spot: StudySpotSparseOut
+    reviews: list[ReviewOut]
+    avg_rating: float | None = None
+    review_count: int = 0
+    active_checkins: int = 0
+    # None when no user_id was given
+    is_user_checkin: bool | None = None
+
+
+class SimilarSpotOut(BaseModel):
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    score: float
+
+
+# Map viewport responses: clusters at low zoom, lightweight markers at high zoom
+class SpotCluster(BaseModel):
+    count: int
+    latitude: float
+    longitude: float
+    max_rating: float | None = None
+
+
+class SpotMarker(BaseModel):
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    status: SpotStatus | None = None
+    avg_rating: float | None = None
+
+
+class ViewportOut(BaseModel):
+    zoom: int
+    clustered: bool
+    clusters: list[SpotCluster] = []
+    spots: list[SpotMarker] = []
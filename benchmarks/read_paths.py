@@ -0,0 +1,95 @@
+"""Compare the ORM read path with the column-projection path in app/db/reads.py.
+
+Runs against an in-memory SQLite database, so no .env is needed:
+
+    python -m benchmarks.read_paths [--reviews 5000] [--repeat 20]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.reads import review_rows, user_rows
+from app.models.checkin import Checkin  # noqa: F401  (registers mappers)
+from app.models.photo import Photo  # noqa: F401
+from app.models.review import Review
+from app.models.studyspot import StudySpot
+from app.models.user import User
+
+
+def seed(db, n_users: int, n_spots: int, n_reviews: int) -> None:
+    db.add_all(User(name=f"user{i}", email=f"user{i}@example.com", password="x") for i in range(n_users))
+    db.add_all(
+        StudySpot(name=f"spot{i}", place_id=f"place{i}", latitude=1.3 + i * 1e-4, longitude=103.8 + i * 1e-4)
+        for i in range(n_spots)
+    )
+    db.flush()
+    db.add_all(
+        Review(studyspot_id=i % n_spots + 1, user_id=i % n_users + 1, rating=i % 5 + 1, comment="benchmark")
+        for i in range(n_reviews)
+    )
+    db.commit()
+
+
+def orm_reviews(db, limit: int) -> list[dict]:
+    # the pre-projection implementation: full entities + lazy r.user per row
+    reviews = db.query(Review).order_by(Review.id.desc()).limit(limit).all()
+    return [
+        {
+            "id": r.id,
+            "studyspot_id": r.studyspot_id,
+            "user_id": r.user_id,
+            "rating": r.rating,
+            "comment": r.comment,
+            "created_at": r.created_at,
+            "user_name": getattr(r.user, "name", None) if r.user else None,
+        }
+        for r in reviews
+    ]
+
+
+def orm_users(db) -> list[User]:
+    return db.query(User).all()
+
+
+def timed(session_factory, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # fresh session each run so the identity map starts empty, as in a real request
+        db = session_factory()
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+        db.close()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--spots", type=int, default=200)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        seed(db, args.users, args.spots, args.reviews)
+
+    cases = [
+        ("reviews (orm)", lambda db: orm_reviews(db, args.limit)),
+        ("reviews (projection)", lambda db: review_rows(db, limit=args.limit)),
+        ("users (orm)", orm_users),
+        ("users (projection)", user_rows),
+    ]
+    for name, fn in cases:
+        print(f"{name:<24} {timed(Session, fn, args.repeat) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { StudySpot, Review } from '../types';
-import { studySpotApi, reviewApi } from '../services/api';
+import { studySpotApi } from '../services/api';
 import { StarIcon } from '@heroicons/react/24/solid';
 
 const StudySpotDetailsPage: React.FC = () => {
@@ -14,23 +14,28 @@ const StudySpotDetailsPage: React.FC = () => {
   const [uploading, setUploading] = useState(false);
   const navigate = useNavigate();
 
+  // Spot, photos and reviews come back from a single request (the same 100
+  // reviews the page showed when it called /reviews/by-spot)
   useEffect(() => {
     if (!id) return;
 
-    const fetchSpot = async () => {
+    const fetchDetails = async () => {
       try {
         setLoadingSpot(true);
-        const response = await studySpotApi.get(id);
-        setSpot(response.data);
+        setLoadingReviews(true);
+        const response = await studySpotApi.details(id, { review_limit: 100 });
+        setSpot(response.data.spot);
+        setReviews(response.data.reviews);
       } catch (err) {
         setError('Failed to fetch study spot');
         console.error('Error fetching spot:', err);
       } finally {
         setLoadingSpot(false);
+        setLoadingReviews(false);
       }
     };
 
-    fetchSpot();
+    fetchDetails();
   }, [id]);
 
   const handleFileUpload = async (file?: File) => {
@@ -66,24 +71,6 @@ const StudySpotDetailsPage: React.FC = () => {
     }
   };
 
-  // Fetch reviews for the spot
-  useEffect(() => {
-    if (!id) return;
-
-    const fetchReviews = async () => {
-      try {
-        setLoadingReviews(true);
-        const response = await reviewApi.listBySpot(Number(id));
-        setReviews(response.data);
-      } catch (err) {
-        console.error('Error fetching reviews:', err);
-      } finally {
-        setLoadingReviews(false);
-      }
-    };
-
-    fetchReviews();
-  }, [id]);
 
 
   if (loadingSpot) return <p>Loading spot...</p>;
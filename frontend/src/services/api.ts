@@ -1,12 +1,29 @@
 import axios from 'axios';
-import { User, UserCreate, StudySpot, StudySpotCreate, Review, ReviewCreate, CheckinCreate, StudySpotCheckinResponse, UserCheckinStatusResponse } from '../types';
+import { User, UserCreate, StudySpot, StudySpotCreate, Review, ReviewCreate, CheckinCreate, StudySpotCheckinResponse, UserCheckinStatusResponse, UserActiveCheckinsResponse, ViewportResponse, StudySpotDetails } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_BASE_URL;
 
+// Per-browser id: after this browser writes, the backend serves its reads
+// from the primary database for a few seconds so it sees its own changes
+const CLIENT_ID_KEY = 'where2mug.clientId';
+
+const getClientId = (): string => {
+  let clientId = localStorage.getItem(CLIENT_ID_KEY);
+  if (!clientId) {
+    // randomUUID needs a secure context; plain-http deployments fall back
+    clientId = typeof crypto !== 'undefined' && 'randomUUID' in crypto
+      ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem(CLIENT_ID_KEY, clientId);
+  }
+  return clientId;
+};
+
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
+    'X-Client-Id': getClientId(),
   },
 });
 
@@ -18,14 +35,24 @@ export const userApi = {
   login: (payload: { email: string; password: string }) => api.post<User>('/users/login', payload),
 };
 
+// Sparse fieldsets accepted by the study spot read endpoints
+type SparseParams = { fields?: string; include?: string };
+
 // Study Spot API
 export const studySpotApi = {
   create: (spot: StudySpotCreate) => api.post<StudySpot>('/studyspots/', spot),
-  list: () => api.get<StudySpot[]>('/studyspots/'),
-  get: (id: string | number) => api.get<StudySpot>(`/studyspots/${id}`),
+  // fields: comma-separated spot columns; include: photos,active_checkins,avg_rating
+  list: (params?: SparseParams) => api.get<StudySpot[]>('/studyspots/', { params }),
+  get: (id: string | number, params?: SparseParams) => api.get<StudySpot>(`/studyspots/${id}`, { params }),
+  // Spot, photos, first page of reviews, rating summary and check-in status in one call
+  details: (id: string | number, params?: { user_id?: number; review_limit?: number }) =>
+    api.get<StudySpotDetails>(`/studyspots/${id}/details`, { params }),
   // Search with optional location/radius and min_avg_rating
-  search: (params: { lat?: number; lon?: number; radius_km?: number; min_avg_rating?: number }) =>
+  search: (params: { lat?: number; lon?: number; radius_km?: number; min_avg_rating?: number } & SparseParams) =>
     api.get<StudySpot[]>('/studyspots/search', { params }),
+  // Clusters (low zoom) or lightweight markers (high zoom) inside the map bounds
+  viewport: (params: { min_lat: number; min_lon: number; max_lat: number; max_lon: number; zoom: number }) =>
+    api.get<ViewportResponse>('/studyspots/viewport', { params }),
   presignPhoto: (spotId: number | string, payload: { filename: string; content_type: string }) =>
     api.post(`/studyspots/${spotId}/photos/presign`, payload),
   notifyPhoto: (spotId: number | string, payload: { key: string; url: string; is_primary?: boolean }) =>
@@ -64,6 +91,18 @@ export const checkinApi = {
   getStudySpotCheckinStatus: async (studyspot_id: number) => {
     const response = await api.post<StudySpotCheckinResponse>(`/checkin/studyspotCheckinStatus/${studyspot_id}`);
     return response.data;
+  },
+
+  // Active counts for many spots in one request (up to 200 ids)
+  getStudySpotsCheckinStatus: async (studyspot_ids: number[]) => {
+    const response = await api.post<StudySpotCheckinResponse[]>(`/checkin/studyspotCheckinStatus`, { studyspot_ids });
+    return response.data;
+  },
+
+  // Every spot the user is currently checked into
+  getUserActiveCheckins: async (user_id: number) => {
+    const response = await api.post<UserActiveCheckinsResponse>(`/checkin/userActiveCheckins`, { user_id });
+    return response.data;
   }
 };
 
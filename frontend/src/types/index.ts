@@ -27,6 +27,29 @@ export interface StudySpot {
   photos?: Photo[];
 }
 
+export interface SpotCluster {
+  count: number;
+  latitude: number;
+  longitude: number;
+  max_rating?: number;
+}
+
+export interface SpotMarker {
+  id: number;
+  name: string;
+  latitude: number;
+  longitude: number;
+  status?: 'pending' | 'active' | 'closed' | null;
+  avg_rating?: number;
+}
+
+export interface ViewportResponse {
+  zoom: number;
+  clustered: boolean;
+  clusters: SpotCluster[];
+  spots: SpotMarker[];
+}
+
 export interface Photo {
   id: number;
   url: string;
@@ -54,6 +77,15 @@ export interface Review {
   created_at: string;
 }
 
+export interface StudySpotDetails {
+  spot: StudySpot;
+  reviews: Review[];
+  avg_rating?: number;
+  review_count: number;
+  active_checkins: number;
+  is_user_checkin?: boolean;
+}
+
 export interface ReviewCreate {
   studyspot_id: number;
   user_id: number;
@@ -76,3 +108,8 @@ export interface StudySpotCheckinResponse {
   studyspot_id: number;
   active_checkins: number;
 }
+
+export interface UserActiveCheckinsResponse {
+  user_id: number;
+  studyspot_ids: number[];
+}
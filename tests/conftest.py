@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings requires the Postgres connection fields even when nothing connects
+for name, value in {
+    "DB_USERNAME": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+# Two SQLite files stand in for the primary and a read replica; "replication"
+# is done by hand in the tests. Must be set before app.db.session is imported.
+_db_dir = tempfile.mkdtemp(prefix="where2mug-tests-")
+os.environ["PRIMARY_DATABASE_URL"] = f"sqlite:///{_db_dir}/primary.db"
+os.environ["READ_DATABASE_URL"] = f"sqlite:///{_db_dir}/replica.db"
+# App-level tests make many requests from one address; the middleware has its
+# own tests in test_admission.py
+os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+
+
+@pytest.fixture
+def client():
+    """A TestClient on empty primary and replica databases."""
+    from fastapi.testclient import TestClient
+
+    from app.core.cache import response_cache
+    from app.db import session
+    from app.db.base import Base, create_tables
+    from app.main import app
+
+    for bind in (session.engine, session.read_engine):
+        Base.metadata.drop_all(bind=bind)
+        create_tables(bind)
+    response_cache.clear()
+    session._pinned_until.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def seed(client):
+    """Write rows to the primary and the replica, as if already replicated."""
+    from sqlalchemy.orm import Session
+
+    from app.db import session
+
+    def add(*rows):
+        for bind in (session.engine, session.read_engine):
+            with Session(bind=bind) as db:
+                for row in rows:
+                    db.merge(row)
+                db.commit()
+    return add
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionControlMiddleware, build_rules
+from app.core.config import settings
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture
+def client():
+    limits = settings.model_copy(update={"RATE_LIMIT_BURST": 2, "RATE_LIMIT_PER_SECOND": 0.01})
+    return TestClient(AdmissionControlMiddleware(ok_app, build_rules(limits)))
+
+
+def test_rotating_client_id_does_not_reset_rate_limit(client):
+    codes = [
+        client.get("/api/v1/studyspots/search", headers={"X-Client-Id": f"c{i}"}).status_code
+        for i in range(3)
+    ]
+    assert codes == [200, 200, 429]
+
+
+@pytest.mark.parametrize("path, limited", [
+    ("/api/v1/studyspots/", True),
+    ("/api/v1/studyspots/search", True),
+    ("/api/v1/studyspots/viewport", True),
+    ("/api/v1/studyspots/7/details", True),
+    ("/api/v1/studyspots/7", False),
+    ("/api/v1/reviews/", False),
+])
+def test_expensive_routes(client, path, limited):
+    codes = {client.get(path).status_code for _ in range(3)}
+    assert (429 in codes) == limited
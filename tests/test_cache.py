@@ -0,0 +1,181 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import (
+    CHECKINS_TAG,
+    REVIEWS_TAG,
+    SPOTS_TAG,
+    LocalSharedStore,
+    LRUBackend,
+    ResponseCache,
+    SharedCacheBackend,
+    spot_tag,
+)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def backend(request):
+    if request.param == "memory":
+        return LRUBackend(max_entries=64)
+    return SharedCacheBackend(LocalSharedStore())
+
+
+def spot_list_tags(spots):
+    return [spot_tag(spot["id"], CHECKINS_TAG) for spot in spots]
+
+
+def run_concurrently(caches, key, compute, workers=20):
+    barrier = threading.Barrier(workers)
+    results = []
+
+    def worker(cache):
+        barrier.wait()
+        results.append(cache.get_or_set(key, compute))
+
+    threads = [threading.Thread(target=worker, args=(caches[i % len(caches)],)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_compute_once(backend):
+    cache = ResponseCache(backend)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    assert run_concurrently([cache], "k", compute) == ["value"] * 20
+    assert len(calls) == 1
+
+
+def test_lease_is_shared_across_workers():
+    # two caches on one store stand in for two worker processes
+    backend = SharedCacheBackend(LocalSharedStore())
+    caches = [ResponseCache(backend), ResponseCache(backend)]
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "value"
+
+    assert run_concurrently(caches, "k", compute) == ["value"] * 20
+    assert len(calls) == 1
+    assert backend.get("lock:k") is None
+
+
+def test_expired_lease_is_taken_over(backend):
+    cache = ResponseCache(backend, lease_ttl=1.0)
+    # a worker that died while holding the lease
+    backend.add("lock:k", "dead-worker", 1.0)
+
+    started = time.monotonic()
+    assert cache.get_or_set("k", lambda: "value") == "value"
+    assert 0.5 < time.monotonic() - started < 3.0
+    assert cache.get_or_set("k", lambda: "other") == "value"
+
+
+def test_invalidation_is_scoped_to_tags(backend):
+    cache = ResponseCache(backend)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"id": 1}, {"id": 2}]
+
+    def get():
+        return cache.get_or_set(
+            "list", compute, tags=(SPOTS_TAG,), value_tags=spot_list_tags, guard_tags=(CHECKINS_TAG,)
+        )
+
+    get()
+    cache.invalidate_spot(REVIEWS_TAG, 1)
+    cache.invalidate_spot(CHECKINS_TAG, 3)
+    get()
+    assert len(calls) == 1
+
+    cache.invalidate_spot(CHECKINS_TAG, 2)
+    get()
+    assert len(calls) == 2
+
+    cache.invalidate(SPOTS_TAG)
+    get()
+    assert len(calls) == 3
+
+
+def racing_write(cache, tag):
+    """A compute whose first run is overtaken by a write invalidating ``tag``."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        if len(calls) == 1:
+            cache.invalidate(tag)
+        return len(calls)
+    return compute
+
+
+def test_invalidation_during_compute_is_not_stored(backend):
+    cache = ResponseCache(backend)
+
+    tags = (spot_tag(1, REVIEWS_TAG),)
+    compute = racing_write(cache, tags[0])
+    assert cache.get_or_set("a", compute, tags=tags) == 1
+    assert cache.get_or_set("a", compute, tags=tags) == 2
+    assert cache.get_or_set("a", compute, tags=tags) == 2
+
+
+def test_guard_tag_invalidation_during_compute_is_not_stored(backend):
+    cache = ResponseCache(backend)
+
+    kwargs = dict(value_tags=lambda value: [spot_tag(1, CHECKINS_TAG)], guard_tags=(CHECKINS_TAG,))
+    compute = racing_write(cache, CHECKINS_TAG)
+    assert cache.get_or_set("b", compute, **kwargs) == 1
+    assert cache.get_or_set("b", compute, **kwargs) == 2
+    assert cache.get_or_set("b", compute, **kwargs) == 2
+
+
+def test_recently_invalidated_entries_are_not_filled_within_lag_window(backend):
+    cache = ResponseCache(backend)
+    tags = (spot_tag(1, REVIEWS_TAG),)
+    calls = []
+
+    def get():
+        return cache.get_or_set("k", lambda: calls.append(1) or len(calls), tags=tags, lag_window=0.3)
+
+    get()
+    get()
+    assert len(calls) == 1
+
+    cache.invalidate(*tags)
+    assert (get(), get()) == (2, 3)
+    time.sleep(0.3)
+    assert (get(), get()) == (4, 4)
+
+
+def test_shared_clear_only_drops_own_keys():
+    store = LocalSharedStore()
+    ours, theirs = SharedCacheBackend(store, prefix="a:"), SharedCacheBackend(store, prefix="b:")
+    ours.set("k", 1)
+    theirs.set("k", 2)
+    ours.clear()
+    assert (ours.get("k"), theirs.get("k")) == (None, 2)
+
+
+def test_failed_compute_releases_lease(backend):
+    cache = ResponseCache(backend)
+
+    def boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_set("k", boom)
+    assert backend.get("lock:k") is None
+    assert cache.get_or_set("k", lambda: "value") == "value"
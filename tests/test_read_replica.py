@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import session
+from app.models.review import Review
+from app.models.studyspot import StudySpot
+from app.models.user import User
+
+A = {"X-Client-Id": "client-a"}
+B = {"X-Client-Id": "client-b"}
+
+
+def replicate(*rows):
+    """Copy rows to the replica, as replication eventually would."""
+    # a plain Session: ReadSessionLocal refuses writes
+    with Session(bind=session.read_engine) as db:
+        for row in rows:
+            db.merge(row)
+        db.commit()
+
+
+@pytest.fixture(autouse=True)
+def setup(seed, monkeypatch):
+    assert session.read_engine is not session.engine
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.5)
+    seed(
+        User(id=1, name="alice", email="a@example.com", password="x"),
+        StudySpot(id=1, name="Library", place_id="p1", latitude=1.3, longitude=103.8),
+    )
+
+
+def post_review(client):
+    response = client.post(
+        "/api/v1/reviews/",
+        json={"studyspot_id": 1, "user_id": 1, "rating": 5, "comment": "quiet"},
+        headers=A,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_writer_reads_own_write_after_other_client_reads_replica(client):
+    assert client.get("/api/v1/reviews/by-spot/1", headers=B).json() == []
+    review = post_review(client)
+
+    # B still reads the lagging replica...
+    assert client.get("/api/v1/reviews/by-spot/1", headers=B).json() == []
+    # ...but that must not be cached for A, who is pinned to the primary
+    assert [r["id"] for r in client.get("/api/v1/reviews/by-spot/1", headers=A).json()] == [review["id"]]
+
+
+def test_replica_reads_are_cached_once_lag_window_passes(client):
+    post_review(client)
+    with session.SessionLocal() as db:
+        replicate(*db.query(Review).all())
+    time.sleep(settings.READ_YOUR_WRITES_SECONDS)
+
+    assert len(client.get("/api/v1/reviews/by-spot/1", headers=B).json()) == 1
+    # served from the cache, not the replica
+    with Session(bind=session.read_engine) as db:
+        db.query(Review).delete()
+        db.commit()
+    assert len(client.get("/api/v1/reviews/by-spot/1", headers=B).json()) == 1
+
+
+def test_replica_sessions_reject_writes():
+    with session.ReadSessionLocal() as db:
+        db.add(User(name="bob", email="b@example.com", password="x"))
+        with pytest.raises(RuntimeError):
+            db.flush()
+
+
+def test_writes_without_client_id_pin_nobody(client):
+    # e.g. everyone behind one campus NAT shares the remote address
+    response = client.post("/api/v1/reviews/", json={"studyspot_id": 1, "user_id": 1, "rating": 4})
+    assert response.status_code == 200
+    assert session._pinned_until == {}
+    assert client.get("/api/v1/reviews/by-spot/1").json() == []
@@ -0,0 +1,116 @@
+import math
+import random
+
+import pytest
+
+from app.models.checkin import Checkin
+from app.models.review import Review
+from app.models.studyspot import StudySpot
+from app.models.user import User
+
+CENTER = (1.33, 103.83)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(min(1.0, a)))
+
+
+@pytest.fixture
+def dataset(seed):
+    rng = random.Random(7)
+    users = [User(id=i, name=f"u{i}", email=f"u{i}@example.com", password="x") for i in range(1, 6)]
+    spots = [
+        StudySpot(id=i, name=f"s{i}", place_id=f"p{i}", latitude=1.30 + i * 0.002, longitude=103.80 + i * 0.002)
+        for i in range(1, 41)
+    ]
+    reviews = [
+        Review(id=len(spots) * u + s.id, studyspot_id=s.id, user_id=u, rating=rng.randint(1, 5))
+        for s in spots
+        for u in range(1, 6)
+        if rng.random() < 0.4
+    ]
+    checkins = [
+        Checkin(
+            checkin_id=i,
+            studyspot_id=rng.randint(1, 40),
+            user_id=rng.randint(1, 5),
+            checkin_timestamp=1.0,
+            checkout_timestamp=None if i % 3 else 2.0,
+        )
+        for i in range(1, 151)
+    ]
+    seed(*users, *spots, *reviews, *checkins)
+    return spots, reviews, checkins
+
+
+def expected(dataset, lat=None, lon=None, radius_km=1.0, min_avg_rating=None, min_active_checkins=None):
+    """The search semantics, computed in Python."""
+    spots, reviews, checkins = dataset
+    out = []
+    for spot in spots:
+        ratings = [r.rating for r in reviews if r.studyspot_id == spot.id]
+        avg = sum(ratings) / len(ratings) if ratings else None
+        active = sum(1 for c in checkins if c.studyspot_id == spot.id and c.checkout_timestamp is None)
+        distance = None
+        if lat is not None:
+            distance = haversine_km(lat, lon, spot.latitude, spot.longitude)
+            if distance > radius_km:
+                continue
+        if min_avg_rating is not None and (avg is None or avg < min_avg_rating):
+            continue
+        if min_active_checkins is not None and active < min_active_checkins:
+            continue
+        out.append((spot.id, distance, avg, active))
+    if lat is not None:
+        out.sort(key=lambda row: (row[1], row[0]))
+    return out
+
+
+def search(client, **params):
+    response = client.get("/api/v1/studyspots/search", params=params)
+    assert response.status_code == 200, response.text
+    return [(s["id"], s.get("distance_km"), s["avg_rating"], s["active_checkins"]) for s in response.json()]
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    dict(lat=CENTER[0], lon=CENTER[1], radius_km=3),
+    dict(lat=CENTER[0], lon=CENTER[1], radius_km=5, min_avg_rating=3),
+    dict(min_avg_rating=4),
+    dict(min_active_checkins=3),
+    dict(min_active_checkins=0),
+    dict(lat=1.36, lon=103.86, radius_km=4, min_active_checkins=2, min_avg_rating=2),
+])
+def test_search_matches_python_semantics(client, dataset, params):
+    got = search(client, **params)
+    want = expected(dataset, **params)
+    assert [row[0] for row in got] == [row[0] for row in want]
+    for (_, distance, avg, active), (_, want_distance, want_avg, want_active) in zip(got, want):
+        assert distance == pytest.approx(want_distance)
+        assert avg == pytest.approx(want_avg)
+        assert active == want_active
+
+
+def test_search_orders_by_distance(client, dataset):
+    distances = [row[1] for row in search(client, lat=CENTER[0], lon=CENTER[1], radius_km=10)]
+    assert len(distances) > 1 and distances == sorted(distances)
+
+
+def test_search_across_antimeridian(client, seed):
+    seed(
+        StudySpot(id=1, name="east", place_id="e", latitude=-17.0, longitude=179.95),
+        StudySpot(id=2, name="west", place_id="w", latitude=-17.0, longitude=-179.95),
+        StudySpot(id=3, name="far", place_id="f", latitude=-17.0, longitude=170.0),
+    )
+    assert [row[0] for row in search(client, lat=-17.0, lon=-179.99, radius_km=20)] == [2, 1]
+
+
+def test_search_radius_covering_the_globe(client, seed):
+    seed(
+        StudySpot(id=1, name="here", place_id="h", latitude=10.0, longitude=20.0),
+        StudySpot(id=2, name="antipode", place_id="a", latitude=-10.0, longitude=-160.0),
+    )
+    assert [row[0] for row in search(client, lat=10.0, lon=20.0, radius_km=20100)] == [1, 2]
@@ -0,0 +1,86 @@
+import random
+import time
+
+import pytest
+
+from app.db import session
+from app.jobs.similar_spots import refresh_similar_spots
+from app.models.checkin import Checkin
+from app.models.similarity import SimilarSpot, SpotCovisit, UserSpotWeight
+from app.models.studyspot import StudySpot
+from app.models.user import User
+
+USERS = 8
+SPOTS = 10
+
+
+@pytest.fixture
+def people_and_spots(seed):
+    seed(
+        *(User(id=i, name=f"u{i}", email=f"u{i}@example.com", password="x") for i in range(1, USERS + 1)),
+        *(
+            StudySpot(id=i, name=f"s{i}", place_id=f"p{i}", latitude=1.30 + i * 0.01, longitude=103.80)
+            for i in range(1, SPOTS + 1)
+        ),
+    )
+
+
+def snapshot(db):
+    """Job output with float noise from incremental sums rounded away."""
+    similar: dict[int, list] = {}
+    for row in db.query(SimilarSpot):
+        similar.setdefault(row.studyspot_id, []).append((-round(row.score, 6), row.similar_studyspot_id))
+    return {
+        "similar": {spot: sorted(rows) for spot, rows in similar.items()},
+        "covisits": {(r.studyspot_id, r.other_studyspot_id): round(r.weight, 6) for r in db.query(SpotCovisit)},
+        "weights": {(r.user_id, r.studyspot_id): round(r.weight, 6) for r in db.query(UserSpotWeight)},
+    }
+
+
+def test_incremental_refreshes_match_full_rebuild(people_and_spots):
+    rng = random.Random(3)
+    with session.SessionLocal() as db:
+        for round_ in range(6):
+            now = time.time()
+            # check out some of the check-ins left open by earlier rounds (all
+            # of them in the last round, which has no new check-ins)
+            last = round_ == 5
+            for checkin in db.query(Checkin).filter(Checkin.checkout_timestamp.is_(None)):
+                if last or rng.random() < 0.5:
+                    checkin.checkout_timestamp = now
+            # only a few users check in per round, so others are picked up
+            # through their check-outs alone
+            for user_id in [] if last else rng.sample(range(1, USERS + 1), 3):
+                for _ in range(rng.randint(1, 3)):
+                    db.add(Checkin(
+                        studyspot_id=rng.randint(1, SPOTS),
+                        user_id=user_id,
+                        checkin_timestamp=now - rng.uniform(0, 6 * 3600),
+                        checkout_timestamp=None if rng.random() < 0.5 else now,
+                    ))
+            db.commit()
+            refresh_similar_spots(db)
+
+        incremental = snapshot(db)
+        assert incremental["similar"]
+
+        refresh_similar_spots(db, full=True)
+        assert snapshot(db) == incremental
+
+
+def test_refresh_without_new_activity_changes_nothing(people_and_spots):
+    with session.SessionLocal() as db:
+        now = time.time()
+        db.add_all([
+            Checkin(studyspot_id=1, user_id=1, checkin_timestamp=now - 3600, checkout_timestamp=now),
+            Checkin(studyspot_id=2, user_id=1, checkin_timestamp=now - 600, checkout_timestamp=None),
+        ])
+        db.commit()
+        refresh_similar_spots(db)
+        before = snapshot(db)
+        refresh_similar_spots(db)
+        assert snapshot(db) == before
+        assert [(r.studyspot_id, r.similar_studyspot_id) for r in db.query(SimilarSpot).order_by(SimilarSpot.studyspot_id)] == [
+            (1, 2),
+            (2, 1),
+        ]
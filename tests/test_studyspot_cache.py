@@ -0,0 +1,34 @@
+from app.core.cache import response_cache
+from app.models.studyspot import StudySpot
+from app.models.user import User
+from app.routes.v1.studyspots_routes import PER_SPOT_TAGS_MAX
+
+
+def cached_tags(key_prefix):
+    (versions, _), = [
+        entry for key, (_, entry) in response_cache.backend._data.items() if key.startswith(key_prefix)
+    ]
+    return set(versions)
+
+
+def add_spots(seed, count):
+    seed(
+        User(id=1, name="alice", email="a@example.com", password="x"),
+        *(
+            StudySpot(id=i, name=f"s{i}", place_id=f"p{i}", latitude=1.3 + i * 0.001, longitude=103.8)
+            for i in range(1, count + 1)
+        ),
+    )
+
+
+def test_long_listing_uses_aspect_wide_tags(client, seed):
+    add_spots(seed, PER_SPOT_TAGS_MAX + 1)
+    client.get("/api/v1/studyspots/", params={"include": "active_checkins,avg_rating"})
+    assert cached_tags("resp:studyspots:list:") == {"spots", "checkins", "reviews"}
+
+
+def test_short_listing_uses_per_spot_tags(client, seed):
+    add_spots(seed, 2)
+    client.get("/api/v1/studyspots/", params={"include": "avg_rating"})
+    assert cached_tags("resp:studyspots:list:") == {"spots", "spot:1:reviews", "spot:2:reviews"}
+
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import text
+
+from app.db import session
+
+from app.models.review import Review
+from app.models.studyspot import StudySpot
+from app.models.user import User
+from app.routes.v1.studyspots_routes import lon_ranges
+
+
+@pytest.mark.parametrize("min_lon, max_lon, expected", [
+    (100, 110, [(100, 110)]),
+    (-200, 200, [(-180, 180)]),
+    (170, 190, [(170, 180), (-180, -170)]),
+    (170, -170, [(170, 180), (-180, -170)]),
+    (-190, -170, [(170, 180), (-180, -170)]),
+    (530, 540, [(170, 180)]),
+])
+def test_lon_ranges(min_lon, max_lon, expected):
+    assert lon_ranges(min_lon, max_lon) == pytest.approx(expected)
+
+
+@pytest.fixture
+def spots(seed):
+    seed(
+        User(id=1, name="alice", email="a@example.com", password="x"),
+        StudySpot(id=1, name="Singapore", place_id="sg", latitude=1.3, longitude=103.8),
+        StudySpot(id=2, name="Fiji", place_id="fj", latitude=-17.7, longitude=178.0),
+        StudySpot(id=3, name="Samoa", place_id="ws", latitude=-13.8, longitude=-172.0),
+        StudySpot(id=4, name="Unset", place_id="un", latitude=-13.9, longitude=-172.1),
+        Review(id=1, studyspot_id=2, user_id=1, rating=4),
+    )
+    # legacy rows without a status (the ORM default would fill one in)
+    for bind in (session.engine, session.read_engine):
+        with bind.begin() as conn:
+            conn.execute(text("UPDATE study_spots SET status = NULL WHERE id = 4"))
+
+
+def viewport(client, **params):
+    response = client.get("/api/v1/studyspots/viewport", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_zoomed_out_unwrapped_bounds_cluster_everything(client, spots):
+    body = viewport(client, min_lat=-85, max_lat=85, min_lon=-200, max_lon=200, zoom=1)
+    assert body["clustered"]
+    assert sum(c["count"] for c in body["clusters"]) == 4
+
+
+def test_clusters_across_antimeridian(client, spots):
+    body = viewport(client, min_lat=-30, max_lat=0, min_lon=170, max_lon=190, zoom=5)
+    assert sum(c["count"] for c in body["clusters"]) == 3
+    assert max(c["max_rating"] or 0 for c in body["clusters"]) == 4.0
+
+
+def test_markers_across_antimeridian(client, spots):
+    body = viewport(client, min_lat=-30, max_lat=0, min_lon=170, max_lon=-170, zoom=15)
+    assert not body["clustered"]
+    assert [(m["id"], m["status"], m["avg_rating"]) for m in body["spots"]] == [
+        (2, "pending", 4.0),
+        (3, "pending", None),
+        (4, None, None),
+    ]
+
+
+def test_inverted_latitudes_are_rejected(client, spots):
+    response = client.get(
+        "/api/v1/studyspots/viewport",
+        params=dict(min_lat=10, max_lat=0, min_lon=0, max_lon=10, zoom=15),
+    )
+    assert response.status_code == 400